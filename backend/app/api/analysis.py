@@ -1,9 +1,11 @@
 """
 Analysis API endpoints
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 from typing import List, Optional
+from dataclasses import asdict
+import hashlib
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,6 +18,20 @@ class SentimentResult(BaseModel):
     timestamp: float
 
 
+class SentimentPoint(BaseModel):
+    timestamp: float
+    mean: float
+    min: float
+    max: float
+    count: int
+
+
+class SentimentTimeline(BaseModel):
+    call_id: str
+    bucket_seconds: Optional[int] = None  # None when points are not downsampled
+    points: List[SentimentPoint]
+
+
 class Keyword(BaseModel):
     word: str
     relevance: float
@@ -38,12 +54,40 @@ async def get_call_analysis(call_id: str):
     raise HTTPException(status_code=404, detail="Analysis not found")
 
 
-@router.get("/{call_id}/sentiment", response_model=List[SentimentResult])
-async def get_sentiment_timeline(call_id: str):
-    """Get sentiment timeline for a call"""
-    # TODO: Implement sentiment timeline retrieval
+@router.get("/{call_id}/sentiment", response_model=SentimentTimeline)
+async def get_sentiment_timeline(
+    call_id: str,
+    request: Request,
+    response: Response,
+    resolution: int = Query(200, ge=1, le=2000),
+    start: Optional[float] = Query(None, ge=0),
+    end: Optional[float] = Query(None, ge=0)
+):
+    """Get sentiment timeline for a call, downsampled to at most `resolution` points"""
+    from app.modules.storage import storage, sentiment_series
+
     logger.info(f"Getting sentiment timeline for call: {call_id}")
-    return []
+    finished = await storage.is_call_finished(call_id)
+    version = await sentiment_series.get_version(call_id)
+    if finished is None and version.count == 0:
+        raise HTTPException(status_code=404, detail="Call not found")
+
+    fingerprint = f"{call_id}:{version.count}:{version.last_bucket}:{resolution}:{start}:{end}"
+    etag = f'"{hashlib.sha1(fingerprint.encode()).hexdigest()[:16]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, max-age=3600" if finished is True else "no-cache"
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    bucket_seconds, points = await sentiment_series.get_timeline(call_id, resolution, start, end)
+    response.headers.update(headers)
+    return SentimentTimeline(
+        call_id=call_id,
+        bucket_seconds=bucket_seconds,
+        points=[SentimentPoint(**asdict(p)) for p in points]
+    )
 
 
 @router.get("/{call_id}/keywords", response_model=List[Keyword])
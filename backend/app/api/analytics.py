@@ -0,0 +1,65 @@
+"""
+Analytics API endpoints
+"""
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date, timedelta
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+class KeywordCount(BaseModel):
+    word: str
+    count: int
+
+
+class AnalyticsBucket(BaseModel):
+    period: str
+    bucket_start: date
+    dimension: str
+    value: str
+    calls: int
+    avg_talk_ratio: float
+    avg_questions: float
+    avg_sentiment: float
+    total_duration: float
+    top_keywords: List[KeywordCount]
+
+
+@router.get("/rollups", response_model=List[AnalyticsBucket])
+async def get_rollups(
+    period: str = Query("day", pattern="^(day|week)$"),
+    dimension: str = Query("all", pattern="^(all|rep|tag)$"),
+    value: Optional[str] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    top_keywords: int = Query(5, ge=0, le=50)
+):
+    """Get aggregated call metrics per day or week, by rep or tag"""
+    from app.modules.storage import analytics_rollups
+
+    end = end or date.today()
+    start = start or end - timedelta(days=90)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    logger.info(f"Getting {period} rollups by {dimension}: {start} to {end}")
+    buckets = await analytics_rollups.query(period, dimension, start, end, value, top_keywords)
+    return [
+        AnalyticsBucket(
+            period=b.period,
+            bucket_start=b.bucket_start,
+            dimension=b.dimension,
+            value=b.value,
+            calls=b.calls,
+            avg_talk_ratio=b.avg_talk_ratio,
+            avg_questions=b.avg_questions,
+            avg_sentiment=b.avg_sentiment,
+            total_duration=b.total_duration,
+            top_keywords=[KeywordCount(word=w, count=c) for w, c in b.top_keywords]
+        )
+        for b in buckets
+    ]
@@ -1,12 +1,15 @@
 """
 Calls API endpoints
 """
-from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
 from typing import List, Optional
 from pydantic import BaseModel
+from dataclasses import asdict
 from datetime import datetime
 import logging
 
+from app.api.responses import RangeFileResponse
+
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
@@ -23,6 +26,21 @@ class CallResponse(BaseModel):
     duration: Optional[float] = None
 
 
+class WaveformResponse(BaseModel):
+    start: float
+    end: float
+    samples_per_peak: int
+    min: List[int]
+    max: List[int]
+
+
+AUDIO_MEDIA_TYPES = {
+    "flac": "audio/flac",
+    "opus": "audio/ogg",
+    "wav": "audio/wav"
+}
+
+
 @router.post("/start", response_model=CallResponse)
 async def start_call(request: CallStartRequest):
     """Start a new call recording"""
@@ -68,6 +86,59 @@ async def get_call(call_id: str):
     raise HTTPException(status_code=404, detail="Call not found")
 
 
+async def _get_archived_audio(call_id: str):
+    from app.modules.storage import audio_storage
+    from app.modules.storage.audio import STATE_ARCHIVED, STATE_RAW
+
+    info = await audio_storage.get_audio_file(call_id)
+    if info is None:
+        raise HTTPException(status_code=404, detail="Audio not found")
+    if info.state == STATE_RAW:
+        raise HTTPException(status_code=422, detail="Audio archiving failed")
+    if info.state != STATE_ARCHIVED:
+        raise HTTPException(status_code=409, detail="Audio is still being processed")
+    return info
+
+
+@router.api_route("/{call_id}/audio", methods=["GET", "HEAD"])
+async def get_call_audio(call_id: str, request: Request):
+    """Stream call audio, honoring HTTP Range requests"""
+    info = await _get_archived_audio(call_id)
+    from app.modules.storage import audio_storage
+
+    return RangeFileResponse(
+        info.path,
+        range_header=request.headers.get("range"),
+        media_type=AUDIO_MEDIA_TYPES.get(info.codec, "application/octet-stream"),
+        key=audio_storage.key
+    )
+
+
+@router.get("/{call_id}/waveform", response_model=WaveformResponse)
+async def get_call_waveform(
+    call_id: str,
+    start: float = Query(0.0, ge=0),
+    end: Optional[float] = Query(None, gt=0),
+    px: int = Query(1000, ge=1, le=10000)
+):
+    """Get min/max waveform peaks for a time range"""
+    from app.modules.storage import audio_storage
+    from app.modules.storage.waveform import read_peaks
+
+    if end is not None and end <= start:
+        raise HTTPException(status_code=422, detail="Waveform end must be after start")
+    info = await _get_archived_audio(call_id)
+    peaks = read_peaks(
+        audio_storage.waveform_dir(call_id),
+        start=start,
+        end=end if end is not None else (info.duration or 0.0),
+        px=px
+    )
+    if peaks is None:
+        raise HTTPException(status_code=404, detail="Waveform not available")
+    return WaveformResponse(**asdict(peaks))
+
+
 @router.delete("/{call_id}")
 async def delete_call(call_id: str):
     """Delete a call"""
@@ -1,9 +1,10 @@
 """
 Configuration API endpoints
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Optional
+from datetime import datetime
+from typing import Dict, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,6 +18,34 @@ class ConfigResponse(BaseModel):
     pii_redaction_enabled: bool
 
 
+class StorageUsageResponse(BaseModel):
+    audio_storage_path: str
+    auto_delete_days: int
+    total_bytes: int
+    file_count: int
+    by_state: Dict[str, int]
+
+
+class BackupReportResponse(BaseModel):
+    path: str
+    started_at: datetime
+    duration_ms: float
+    pages: int
+    steps: int
+    max_step_ms: float
+    max_writer_stall_ms: float
+    size_bytes: int
+
+
+class BackupStatusResponse(BaseModel):
+    enabled: bool
+    backup_path: str
+    interval_hours: int
+    retention_count: int
+    backups: List[str]
+    last_backup: Optional[BackupReportResponse] = None
+
+
 class ConfigUpdateRequest(BaseModel):
     auto_delete_days: Optional[int] = None
     pii_redaction_enabled: Optional[bool] = None
@@ -43,6 +72,55 @@ async def update_config(request: ConfigUpdateRequest):
     return await get_config()
 
 
+@router.get("/storage", response_model=StorageUsageResponse)
+async def get_storage_usage():
+    """Get audio disk usage"""
+    from app.core.config import settings
+    from app.modules.storage import audio_storage
+
+    usage = await audio_storage.get_disk_usage()
+    return StorageUsageResponse(
+        audio_storage_path=settings.AUDIO_STORAGE_PATH,
+        auto_delete_days=settings.AUTO_DELETE_AUDIO_DAYS,
+        total_bytes=usage.total_bytes,
+        file_count=usage.file_count,
+        by_state=usage.by_state
+    )
+
+
+@router.get("/backup", response_model=BackupStatusResponse)
+async def get_backup_status():
+    """Get backup settings, existing backups and the last backup report"""
+    from app.core.config import settings
+    from app.modules.storage import backup_manager
+
+    report = backup_manager.last_report
+    return BackupStatusResponse(
+        enabled=settings.BACKUP_ENABLED,
+        backup_path=str(backup_manager.backup_dir),
+        interval_hours=settings.BACKUP_INTERVAL_HOURS,
+        retention_count=settings.BACKUP_RETENTION_COUNT,
+        backups=[p.name for p in backup_manager.list_backups()],
+        last_backup=BackupReportResponse(**vars(report)) if report else None
+    )
+
+
+@router.post("/backup", response_model=BackupReportResponse)
+async def run_backup():
+    """Take an online database backup now"""
+    from app.core.config import settings
+    from app.modules.storage import backup_manager
+
+    if not settings.BACKUP_ENABLED:
+        raise HTTPException(status_code=409, detail="Backups are disabled (BACKUP_ENABLED)")
+    try:
+        report = await backup_manager.run_backup()
+    except Exception as e:
+        logger.error(f"Backup failed: {e}")
+        raise HTTPException(status_code=500, detail="Backup failed")
+    return BackupReportResponse(**vars(report))
+
+
 @router.get("/models")
 async def list_models():
     """List available models"""
@@ -0,0 +1,53 @@
+"""
+Export API endpoints
+"""
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.get("/calls")
+async def export_calls(
+    format: str = Query("ndjson", pattern="^(ndjson|parquet)$"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    rep: Optional[str] = None,
+    tag: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    """Stream calls with transcripts, segments and metrics"""
+    from app.modules.storage import storage
+    from app.modules.storage.export import ExportFilter, EXPORT_FIELDS, iter_ndjson, iter_parquet
+
+    try:
+        filters = ExportFilter(
+            start=start,
+            end=end,
+            rep=rep,
+            tag=tag,
+            fields=tuple(f.strip() for f in fields.split(",")) if fields else EXPORT_FIELDS
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    logger.info(f"Exporting calls as {format}: start={start}, end={end}")
+    if format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+        return StreamingResponse(
+            iter_parquet(storage, filters),
+            media_type="application/vnd.apache.parquet",
+            headers={"Content-Disposition": 'attachment; filename="calls.parquet"'}
+        )
+    return StreamingResponse(
+        iter_ndjson(storage, filters),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="calls.ndjson"'}
+    )
@@ -0,0 +1,142 @@
+"""
+Custom API responses
+"""
+from typing import Optional, Tuple
+import os
+
+import anyio
+from fastapi import HTTPException
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.crypto import ENCRYPTED_SUFFIX, EncryptedReader
+
+
+def parse_range_header(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single-range "bytes=" header into an inclusive (start, end)
+
+    Returns None when no range was requested, and for multi-range requests,
+    which are answered with the full file. Raises HTTPException 416 for
+    ranges that cannot be satisfied.
+    """
+    if not range_header:
+        return None
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec or "," in spec:
+        return None
+    start_text, _, end_text = spec.strip().partition("-")
+    try:
+        if start_text:
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(size - int(end_text), 0)
+            end = size - 1
+    except ValueError:
+        return None
+    end = min(end, size - 1)
+    if start > end or start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, end
+
+
+class RangeFileResponse(Response):
+    """File response supporting HTTP Range requests
+
+    Uses the ASGI zero-copy extension (os.sendfile) when the server offers
+    it and falls back to streaming the byte range in chunks otherwise.
+    Encrypted containers are served by decrypting only the blocks that
+    overlap the requested range.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(self, path: str, range_header: Optional[str] = None,
+                 media_type: Optional[str] = None, key: Optional[bytes] = None):
+        self.path = path
+        self.key = key if path.endswith(ENCRYPTED_SUFFIX) else None
+        stat = os.stat(path)
+        size = stat.st_size
+        if self.key is not None:
+            with EncryptedReader(path, self.key) as reader:
+                size = reader.size
+        byte_range = parse_range_header(range_header, size)
+        if byte_range is None:
+            self.offset, self.count = 0, size
+            status_code = 200
+        else:
+            self.offset, self.count = byte_range[0], byte_range[1] - byte_range[0] + 1
+            status_code = 206
+
+        super().__init__(status_code=status_code, media_type=media_type)
+        self.headers["accept-ranges"] = "bytes"
+        self.headers["content-length"] = str(self.count)
+        self.headers["etag"] = f'"{stat.st_mtime_ns:x}-{size:x}"'
+        if byte_range is not None:
+            self.headers["content-range"] = f"bytes {byte_range[0]}-{byte_range[1]}/{size}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers
+        })
+        if scope.get("method") == "HEAD" or self.count == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if self.key is not None:
+            await self._send_decrypted(send)
+            return
+
+        if "http.response.zerocopy" in scope.get("extensions", {}):
+            with open(self.path, "rb") as f:
+                await send({
+                    "type": "http.response.zerocopy",
+                    "file": f,
+                    "offset": self.offset,
+                    "count": self.count,
+                    "more_body": False
+                })
+            return
+
+        remaining = self.count
+        async with await anyio.open_file(self.path, mode="rb") as f:
+            await f.seek(self.offset)
+            while remaining > 0:
+                chunk = await f.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": remaining > 0
+                })
+        if remaining > 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def _send_decrypted(self, send: Send) -> None:
+        reader = EncryptedReader(self.path, self.key)
+        try:
+            blocks = reader.iter_range(self.offset, self.count)
+            remaining = self.count
+            while remaining > 0:
+                chunk = await anyio.to_thread.run_sync(next, blocks, None)
+                if chunk is None:
+                    break
+                remaining -= len(chunk)
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": remaining > 0
+                })
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            reader.close()
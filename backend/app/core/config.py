@@ -19,6 +19,8 @@ class Settings(BaseSettings):
     SENTIMENT_MODEL: str = "distilbert-base-uncased-finetuned-sst-2-english"
     MAX_MODEL_MEMORY_MB: int = 2048
     MODEL_CACHE_DIR: str = "./models"
+    ML_BACKEND: str = "local"  # "local" (model load step) or "stub" (skip model loading)
+    PRELOAD_MODELS: bool = False  # load at startup instead of on first inference
     
     # Performance Settings
     AUDIO_CHUNK_SIZE_MS: int = 200
@@ -33,7 +35,16 @@ class Settings(BaseSettings):
     # Storage Settings
     DATABASE_URL: str = "sqlite:///./data/nanalyzer.db"
     AUDIO_STORAGE_PATH: str = "./data/audio"
+    AUDIO_SEGMENT_SECONDS: int = 60
+    AUDIO_ARCHIVE_CODEC: str = "flac"  # flac, opus or wav
+    AUDIO_PURGE_INTERVAL_MINUTES: int = 60
+    AUDIO_PURGE_BATCH_SIZE: int = 100
     BACKUP_ENABLED: bool = False
+    BACKUP_PATH: str = "./data/backups"
+    BACKUP_INTERVAL_HOURS: int = 24
+    BACKUP_RETENTION_COUNT: int = 7
+    BACKUP_PAGES_PER_STEP: int = 256
+    BACKUP_STEP_SLEEP_MS: int = 5
     
     # API Settings
     FRONTEND_URL: str = "http://localhost:3000"
@@ -45,6 +56,7 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str = "change-this-in-production"
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    STORAGE_ENCRYPTION_KEY: str = ""  # urlsafe base64, 32 bytes; empty disables encryption at rest
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,282 @@
+"""
+Encryption at rest
+Chunked AES-GCM container for stored audio, plus field encryption for text
+"""
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Union
+import base64
+import os
+import struct
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+MAGIC = b"NAEC"
+VERSION = 1
+DEFAULT_BLOCK_SIZE = 64 * 1024
+TAG_SIZE = 16
+ENCRYPTED_SUFFIX = ".enc"
+FIELD_PREFIX = "enc:v2:"
+LEGACY_FIELD_PREFIX = "enc:v1:"  # not bound to a row; still readable
+
+# magic, version, 3 reserved bytes, block size, 8-byte random nonce prefix
+_HEADER = struct.Struct("<4sB3xI8s")
+HEADER_SIZE = _HEADER.size
+
+
+class DecryptionError(Exception):
+    """Raised when encrypted data fails authentication"""
+    pass
+
+
+def load_storage_key(encoded: Optional[str] = None) -> Optional[bytes]:
+    """Decode STORAGE_ENCRYPTION_KEY (urlsafe base64, 32 bytes)
+
+    Returns None when encryption at rest is not configured.
+    """
+    if encoded is None:
+        from app.core.config import settings
+        encoded = settings.STORAGE_ENCRYPTION_KEY
+    if not encoded:
+        return None
+    key = base64.urlsafe_b64decode(encoded)
+    if len(key) != 32:
+        raise ValueError("STORAGE_ENCRYPTION_KEY must decode to 32 bytes")
+    return key
+
+
+def generate_key() -> str:
+    """Generate a new encoded storage key"""
+    return base64.urlsafe_b64encode(AESGCM.generate_key(bit_length=256)).decode()
+
+
+def _nonce(prefix: bytes, index: int) -> bytes:
+    return prefix + struct.pack(">I", index)
+
+
+def _aad(header: bytes, index: int, final: bool) -> bytes:
+    # Binding the index and final flag stops blocks being reordered,
+    # dropped from the end, or swapped between files
+    return header + struct.pack("<QB", index, final)
+
+
+class EncryptedWriter:
+    """Streaming writer for the chunked AES-GCM container
+
+    Plaintext is cut into fixed-size blocks, each sealed independently with
+    its own nonce and tag, so any block can later be decrypted on its own.
+    The last block carries a final flag; a full block is only written once
+    more data follows it, so the flag is always set on the true last block.
+    """
+
+    def __init__(self, target: Union[str, Path, BinaryIO], key: bytes,
+                 block_size: int = DEFAULT_BLOCK_SIZE):
+        self._owns_file = not hasattr(target, "write")
+        self._file = open(target, "wb") if self._owns_file else target
+        self._aead = AESGCM(key)
+        self.block_size = block_size
+        self._prefix = os.urandom(8)
+        self._header = _HEADER.pack(MAGIC, VERSION, block_size, self._prefix)
+        self._buffer = bytearray()
+        self._index = 0
+        self.closed = False
+        self._file.write(self._header)
+
+    def _seal(self, block: bytes, final: bool) -> None:
+        nonce = _nonce(self._prefix, self._index)
+        self._file.write(self._aead.encrypt(nonce, block, _aad(self._header, self._index, final)))
+        self._index += 1
+
+    def write(self, data) -> int:
+        self._buffer += data
+        if len(self._buffer) > self.block_size:
+            view = memoryview(self._buffer)
+            pos = 0
+            while len(self._buffer) - pos > self.block_size:
+                self._seal(bytes(view[pos:pos + self.block_size]), final=False)
+                pos += self.block_size
+            view.release()
+            del self._buffer[:pos]
+        return len(data)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self._seal(bytes(self._buffer), final=True)
+        self._buffer = bytearray()
+        self.closed = True
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EncryptedReader:
+    """Random-access reader for the chunked AES-GCM container
+
+    With recover=True a container whose writer was never closed (no block
+    carries the final flag) is still readable: a torn trailing block is
+    dropped and every complete block that authenticates is kept.
+    """
+
+    def __init__(self, path: Union[str, Path], key: bytes, recover: bool = False):
+        self._file = open(path, "rb")
+        self._aead = AESGCM(key)
+        self._header = self._file.read(HEADER_SIZE)
+        if len(self._header) != HEADER_SIZE:
+            raise DecryptionError(f"Truncated header: {path}")
+        magic, version, self.block_size, self._prefix = _HEADER.unpack(self._header)
+        if magic != MAGIC or version != VERSION:
+            raise DecryptionError(f"Not an encrypted container: {path}")
+
+        stored = os.fstat(self._file.fileno()).st_size - HEADER_SIZE
+        stored_block = self.block_size + TAG_SIZE
+        self.block_count = max(1, -(-stored // stored_block))
+        last = stored - (self.block_count - 1) * stored_block - TAG_SIZE
+        self.complete = True
+        if recover and (last < 0 or not self._authenticates(self.block_count - 1, final=True)):
+            self._recover_tail(stored, path)
+            return
+        if last < 0:
+            raise DecryptionError(f"Truncated container: {path}")
+        self.size = (self.block_count - 1) * self.block_size + last
+        self._position = 0
+
+    def _authenticates(self, index: int, final: bool) -> bool:
+        stored_block = self.block_size + TAG_SIZE
+        self._file.seek(HEADER_SIZE + index * stored_block)
+        try:
+            self._aead.decrypt(
+                _nonce(self._prefix, index), self._file.read(stored_block),
+                _aad(self._header, index, final)
+            )
+        except InvalidTag:
+            return False
+        return True
+
+    def _recover_tail(self, stored: int, path) -> None:
+        # Keep only whole blocks; the last one must be a sealed non-final block
+        self.block_count = stored // (self.block_size + TAG_SIZE)
+        if self.block_count and not self._authenticates(self.block_count - 1, final=False):
+            raise DecryptionError(f"Unrecoverable container: {path}")
+        self.complete = False
+        self.size = self.block_count * self.block_size
+        self._position = 0
+
+    def _decrypt(self, index: int, sealed) -> bytes:
+        final = self.complete and index == self.block_count - 1
+        try:
+            return self._aead.decrypt(
+                _nonce(self._prefix, index), sealed, _aad(self._header, index, final)
+            )
+        except InvalidTag:
+            raise DecryptionError(f"Block {index} failed authentication")
+
+    def read_block(self, index: int) -> bytes:
+        """Decrypt and authenticate a single block"""
+        stored_block = self.block_size + TAG_SIZE
+        self._file.seek(HEADER_SIZE + index * stored_block)
+        return self._decrypt(index, self._file.read(stored_block))
+
+    def iter_range(self, offset: int, length: int, read_blocks: int = 16) -> Iterator[bytes]:
+        """Yield the plaintext of [offset, offset + length) block by block
+
+        Consecutive sealed blocks are fetched with a single read of up to
+        read_blocks blocks, then authenticated and decrypted one at a time.
+        """
+        end = min(offset + length, self.size)
+        stored_block = self.block_size + TAG_SIZE
+        while offset < end:
+            first = offset // self.block_size
+            last = min((end - 1) // self.block_size, first + read_blocks - 1)
+            self._file.seek(HEADER_SIZE + first * stored_block)
+            sealed = memoryview(self._file.read((last - first + 1) * stored_block))
+            for index in range(first, last + 1):
+                pos = (index - first) * stored_block
+                block = self._decrypt(index, sealed[pos:pos + stored_block])
+                skip = offset - index * self.block_size
+                piece = block[skip:skip + end - offset]
+                offset += len(piece)
+                yield piece
+
+    def read_range(self, offset: int, length: int) -> bytes:
+        return b"".join(self.iter_range(offset, length))
+
+    # Sequential file-like interface
+
+    def read(self, n: int = -1) -> bytes:
+        if n is None or n < 0:
+            n = self.size - self._position
+        data = self.read_range(self._position, n)
+        self._position += len(data)
+        return data
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._position, os.SEEK_END: self.size}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_for_read(path: Union[str, Path], key: Optional[bytes], recover: bool = False):
+    """Open a stored file for sequential reads, decrypting if needed"""
+    if str(path).endswith(ENCRYPTED_SUFFIX):
+        if key is None:
+            raise DecryptionError(f"No storage key configured to read {path}")
+        return EncryptedReader(path, key, recover=recover)
+    return open(path, "rb")
+
+
+def encrypt_file(source: Union[str, Path], target: Union[str, Path], key: bytes) -> None:
+    """Encrypt a whole file into the container, streaming block by block"""
+    with open(source, "rb") as src, EncryptedWriter(target, key) as out:
+        while block := src.read(DEFAULT_BLOCK_SIZE * 16):
+            out.write(block)
+
+
+def encrypt_field(value: str, key: Optional[bytes], context: str) -> str:
+    """Encrypt a short text value for storage in a database column
+
+    `context` identifies where the value is stored (column and call id) and
+    is authenticated with it, so a value copied to another row or column
+    fails to decrypt.
+    """
+    if key is None:
+        return value
+    nonce = os.urandom(12)
+    sealed = AESGCM(key).encrypt(nonce, value.encode(), (FIELD_PREFIX + context).encode())
+    return FIELD_PREFIX + base64.b64encode(nonce + sealed).decode()
+
+
+def decrypt_field(value: Optional[str], key: Optional[bytes], context: str) -> Optional[str]:
+    """Decrypt a value written by encrypt_field (plaintext passes through)"""
+    if value is None:
+        return value
+    if value.startswith(FIELD_PREFIX):
+        prefix, aad = FIELD_PREFIX, FIELD_PREFIX + context
+    elif value.startswith(LEGACY_FIELD_PREFIX):
+        prefix, aad = LEGACY_FIELD_PREFIX, LEGACY_FIELD_PREFIX
+    else:
+        return value
+    if key is None:
+        raise DecryptionError("No storage key configured to read encrypted field")
+    raw = base64.b64decode(value[len(prefix):])
+    try:
+        return AESGCM(key).decrypt(raw[:12], raw[12:], aad.encode()).decode()
+    except InvalidTag:
+        raise DecryptionError("Encrypted field failed authentication")
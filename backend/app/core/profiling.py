@@ -0,0 +1,71 @@
+"""
+Startup profiling
+Records how long imports, model loads and database init take
+"""
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Phase:
+    """A timed startup phase"""
+    name: str
+    started_at: float  # seconds since the profiler was created
+    duration_ms: float
+
+
+@dataclass
+class StartupProfiler:
+    """Collects timed phases from process start until the app is ready
+
+    Phases recorded after boot (such as models loaded lazily on first
+    inference) are kept as well, so the report shows where time went.
+    """
+    created: float = field(default_factory=time.perf_counter)
+    phases: List[Phase] = field(default_factory=list)
+    ready_ms: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block of code as a named phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.phases.append(Phase(
+                name=name,
+                started_at=start - self.created,
+                duration_ms=(end - start) * 1000
+            ))
+
+    def mark_ready(self) -> None:
+        """Record the time from process start until the app can serve requests"""
+        self.ready_ms = (time.perf_counter() - self.created) * 1000
+
+    def report(self) -> Dict:
+        """Startup breakdown suitable for logging or an API response"""
+        return {
+            "ready_ms": round(self.ready_ms, 1) if self.ready_ms is not None else None,
+            "phases": [
+                {
+                    "name": p.name,
+                    "started_at_ms": round(p.started_at * 1000, 1),
+                    "duration_ms": round(p.duration_ms, 1)
+                }
+                for p in self.phases
+            ]
+        }
+
+    def log_report(self) -> None:
+        breakdown = ", ".join(f"{p.name}={p.duration_ms:.0f}ms" for p in self.phases)
+        logger.info(f"Startup ready in {self.ready_ms:.0f}ms ({breakdown})")
+
+
+# Global instance, created as early as possible during import
+startup_profiler = StartupProfiler()
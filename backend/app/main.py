@@ -1,13 +1,18 @@
 """
 FastAPI application entry point
 """
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from app.core.profiling import startup_profiler
+
+with startup_profiler.phase("import:framework"):
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
 
-from app.core.config import settings
-from app.api import router as api_router
+with startup_profiler.phase("import:config"):
+    from app.core.config import settings
+with startup_profiler.phase("import:api"):
+    from app.api import router as api_router
 
 # Configure logging
 logging.basicConfig(
@@ -23,22 +28,38 @@ async def lifespan(app: FastAPI):
     logger.info("Starting nAnalyzer backend...")
     logger.info(f"Environment: {settings.APP_ENV}")
     
-    # Initialize ML models (async loading)
+    # Initialize ML models (deferred to first inference unless PRELOAD_MODELS)
     try:
         from app.modules.transcription import transcription_engine
         from app.modules.analysis import analysis_engine
         
-        await transcription_engine.initialize()
-        await analysis_engine.initialize()
-        logger.info("ML models loaded successfully")
+        with startup_profiler.phase("init:models"):
+            await transcription_engine.initialize()
+            await analysis_engine.initialize()
     except Exception as e:
         logger.error(f"Failed to load ML models: {e}")
         raise
     
+    # Initialize storage, audio retention and backups
+    from app.modules.storage import storage, audio_storage, backup_manager
+    
+    with startup_profiler.phase("init:database"):
+        await storage.initialize()
+    with startup_profiler.phase("init:audio_storage"):
+        await audio_storage.start()
+    with startup_profiler.phase("init:backup"):
+        await backup_manager.start()
+    
+    startup_profiler.mark_ready()
+    startup_profiler.log_report()
+    
     yield
     
     # Cleanup
     logger.info("Shutting down nAnalyzer backend...")
+    await backup_manager.stop()
+    await audio_storage.stop()
+    await storage.close()
 
 
 app = FastAPI(
@@ -71,6 +92,12 @@ async def root():
     }
 
 
+@app.get("/health/startup")
+async def startup_profile():
+    """Startup time breakdown (imports, model loads, database init)"""
+    return startup_profiler.report()
+
+
 @app.get("/health")
 async def health_check():
     """Detailed health check"""
@@ -18,6 +18,15 @@ class SentimentResult:
     score: float  # confidence score 0-1
     timestamp: float
 
+    @property
+    def signed_score(self) -> float:
+        """Score on a -1..1 scale for timelines (neutral maps to 0)"""
+        if self.label == "positive":
+            return self.score
+        if self.label == "negative":
+            return -self.score
+        return 0.0
+
 
 @dataclass
 class Keyword:
@@ -57,33 +66,57 @@ class AnalysisInterface(ABC):
 
 
 class AnalysisEngine(AnalysisInterface):
-    """Implementation using transformers and NLP tools"""
+    """Implementation using transformers and NLP tools
+    
+    Models are loaded on first inference unless PRELOAD_MODELS is set, so
+    model imports stay out of startup. With ML_BACKEND="stub" the load step
+    is skipped entirely.
+    """
     
     def __init__(self):
         self.sentiment_model = None
         self.model_loaded = False
+        self._load_lock = asyncio.Lock()
         logger.info("AnalysisEngine initialized")
     
     async def initialize(self) -> None:
-        """Load analysis models"""
-        try:
-            # TODO: Load actual models (distilbert, etc.)
-            logger.info("Loading analysis models...")
-            await asyncio.sleep(1)  # Simulate model loading
-            self.model_loaded = True
-            logger.info("Analysis models loaded successfully")
-        except Exception as e:
-            logger.error(f"Failed to load analysis models: {e}")
-            raise
+        """Prepare the engine, loading models now only if PRELOAD_MODELS"""
+        from app.core.config import settings
+        
+        if settings.PRELOAD_MODELS:
+            await self.load_model()
+        else:
+            logger.info("Analysis models will be loaded on first use")
+    
+    async def load_model(self) -> None:
+        """Load analysis models once"""
+        if self.model_loaded:
+            return
+        async with self._load_lock:
+            if self.model_loaded:
+                return
+            from app.core.config import settings
+            from app.core.profiling import startup_profiler
+            
+            try:
+                logger.info(f"Loading analysis models ({settings.ML_BACKEND})...")
+                with startup_profiler.phase("model_load:analysis"):
+                    if settings.ML_BACKEND != "stub":
+                        # TODO: Load actual models (distilbert, etc.)
+                        await asyncio.sleep(1)  # Simulate model loading
+                self.model_loaded = True
+                logger.info("Analysis models loaded successfully")
+            except Exception as e:
+                logger.error(f"Failed to load analysis models: {e}")
+                raise
     
     async def analyze_sentiment(self, text: str) -> SentimentResult:
         """Analyze sentiment of text"""
-        if not self.model_loaded:
-            logger.warning("Model not loaded, cannot analyze")
-            return SentimentResult(label="neutral", score=0.5, timestamp=0.0)
+        import time
+        
+        await self.load_model()
         
         # TODO: Implement actual sentiment analysis
-        import time
         return SentimentResult(
             label="positive",
             score=0.85,
@@ -92,10 +125,6 @@ class AnalysisEngine(AnalysisInterface):
     
     async def extract_keywords(self, text: str) -> List[Keyword]:
         """Extract keywords from text"""
-        if not self.model_loaded:
-            logger.warning("Model not loaded, cannot extract keywords")
-            return []
-        
         # TODO: Implement actual keyword extraction
         return [
             Keyword(word="example", relevance=0.9, count=3),
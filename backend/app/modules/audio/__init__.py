@@ -3,10 +3,13 @@ Audio Capture Module
 Handles audio input from various sources
 """
 from abc import ABC, abstractmethod
-from typing import AsyncIterator, Optional
+from typing import AsyncIterator, Optional, Union
 from dataclasses import dataclass
 import asyncio
 import logging
+import os
+import time
+import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +17,7 @@ logger = logging.getLogger(__name__)
 @dataclass
 class AudioChunk:
     """Audio data chunk"""
-    data: bytes
+    data: Union[bytes, memoryview]  # file sources yield zero-copy views
     timestamp: float
     sample_rate: int = 16000
     channels: int = 1
@@ -28,6 +31,12 @@ class AudioSource:
     device_id: Optional[str] = None
     file_path: Optional[str] = None
     stream_url: Optional[str] = None
+    pacing: str = "realtime"  # "realtime", "accelerated" (speed x), "max"
+    speed: float = 1.0
+    chunk_ms: int = 100
+
+
+PACING_MODES = ("realtime", "accelerated", "max")
 
 
 class AudioCaptureInterface(ABC):
@@ -54,12 +63,28 @@ class AudioCaptureModule(AudioCaptureInterface):
     
     def __init__(self):
         self.active_streams: dict[str, bool] = {}
+        self.sources: dict[str, AudioSource] = {}
         logger.info("AudioCaptureModule initialized")
     
     async def start_capture(self, source: AudioSource) -> str:
         """Start capturing audio from source"""
-        stream_id = f"stream_{id(source)}"
+        if source.type == "file":
+            if not source.file_path:
+                raise ValueError("File source requires file_path")
+            if source.pacing not in PACING_MODES:
+                raise ValueError(f"Unknown pacing mode: {source.pacing}")
+            if source.speed <= 0:
+                raise ValueError("Pacing speed must be positive")
+            if not os.path.isfile(source.file_path) or not os.access(source.file_path, os.R_OK):
+                raise ValueError(f"Audio file not found or not readable: {source.file_path}")
+            from app.modules.audio.file_source import PcmFile
+            
+            # Rejects empty and unsupported files before the stream is registered
+            PcmFile(source.file_path).close()
+        
+        stream_id = f"stream_{uuid.uuid4().hex[:12]}"
         self.active_streams[stream_id] = True
+        self.sources[stream_id] = source
         logger.info(f"Started capture from {source.type}: {stream_id}")
         return stream_id
     
@@ -67,14 +92,19 @@ class AudioCaptureModule(AudioCaptureInterface):
         """Stop capturing audio"""
         if stream_id in self.active_streams:
             self.active_streams[stream_id] = False
+            self.sources.pop(stream_id, None)
             logger.info(f"Stopped capture: {stream_id}")
     
     async def get_audio_stream(self, stream_id: str) -> AsyncIterator[AudioChunk]:
         """Get audio chunks as they arrive"""
+        source = self.sources.get(stream_id)
+        if source is not None and source.type == "file":
+            async for chunk in self._replay_file(stream_id, source):
+                yield chunk
+            return
+        
         # TODO: Implement actual audio capture
         # This is a placeholder that yields empty chunks
-        import time
-        
         while self.active_streams.get(stream_id, False):
             # Simulate audio chunk generation
             yield AudioChunk(
@@ -85,6 +115,42 @@ class AudioCaptureModule(AudioCaptureInterface):
                 format="pcm16"
             )
             await asyncio.sleep(0.1)  # 100ms chunks
+    
+    async def _replay_file(self, stream_id: str, source: AudioSource) -> AsyncIterator[AudioChunk]:
+        """Replay a recorded file through the live pipeline
+        
+        Chunks are paced against a monotonic clock from the start of the
+        replay, so sleep jitter does not accumulate over long files.
+        """
+        from app.modules.audio.file_source import PcmFile
+        
+        pcm = None
+        try:
+            pcm = PcmFile(source.file_path)
+            speed = 1.0 if source.pacing == "realtime" else source.speed
+            started_wall = time.time()
+            started = time.monotonic()
+            for offset, data in pcm.chunks(source.chunk_ms):
+                if not self.active_streams.get(stream_id, False):
+                    break
+                if source.pacing == "max":
+                    await asyncio.sleep(0)
+                else:
+                    # A chunk "arrives" once all of its audio has been captured
+                    chunk_end = offset + len(data) / (pcm.sample_rate * pcm.frame_size)
+                    await asyncio.sleep(max(0.0, started + chunk_end / speed - time.monotonic()))
+                yield AudioChunk(
+                    data=data,
+                    timestamp=started_wall + offset,
+                    sample_rate=pcm.sample_rate,
+                    channels=pcm.channels,
+                    format="pcm16"
+                )
+        finally:
+            self.active_streams[stream_id] = False
+            self.sources.pop(stream_id, None)
+            if pcm is not None:
+                pcm.close()
 
 
 # Global instance
@@ -0,0 +1,99 @@
+"""
+File Audio Source
+Memory-mapped WAV/PCM reader for replaying recorded calls
+"""
+from pathlib import Path
+from typing import Iterator, Tuple
+import logging
+import mmap
+import struct
+
+logger = logging.getLogger(__name__)
+
+# Raw .pcm files carry no header and are assumed to be 16kHz mono pcm16
+RAW_SAMPLE_RATE = 16000
+RAW_CHANNELS = 1
+
+
+class PcmFile:
+    """Memory-mapped pcm16 audio from a WAV or raw .pcm file
+
+    Chunks are memoryview slices of the mapping, so replaying a file never
+    copies audio data. Views must be released before close() can unmap the
+    file; if any are still alive the mapping is left to the garbage collector.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._file.close()
+            raise ValueError(f"Audio file is empty: {path}")
+        self._view = memoryview(self._mmap)
+
+        try:
+            if self._mmap[:4] == b"RIFF" and self._mmap[8:12] == b"WAVE":
+                self._parse_wav()
+            else:
+                self.sample_rate = RAW_SAMPLE_RATE
+                self.channels = RAW_CHANNELS
+                self.data_offset = 0
+                self.data_length = len(self._mmap)
+        except struct.error:
+            self.close()
+            raise ValueError(f"Truncated WAV header: {path}")
+        except ValueError:
+            self.close()
+            raise
+        self.data_length -= self.data_length % self.frame_size
+
+    @property
+    def frame_size(self) -> int:
+        return 2 * self.channels
+
+    @property
+    def duration(self) -> float:
+        return self.data_length / (self.sample_rate * self.frame_size)
+
+    def _parse_wav(self) -> None:
+        pos = 12
+        fmt_found = False
+        while pos + 8 <= len(self._mmap):
+            chunk_id, size = struct.unpack_from("<4sI", self._mmap, pos)
+            body = pos + 8
+            if chunk_id == b"fmt ":
+                audio_format, channels, sample_rate, _, _, bits = struct.unpack_from("<HHIIHH", self._mmap, body)
+                if audio_format != 1 or bits != 16:
+                    raise ValueError(f"Only 16-bit PCM WAV files are supported: {self.path}")
+                self.channels = channels
+                self.sample_rate = sample_rate
+                fmt_found = True
+            elif chunk_id == b"data":
+                if not fmt_found:
+                    raise ValueError(f"WAV data chunk before fmt chunk: {self.path}")
+                self.data_offset = body
+                self.data_length = min(size, len(self._mmap) - body)
+                return
+            pos = body + size + (size & 1)
+        raise ValueError(f"WAV file has no data chunk: {self.path}")
+
+    def chunks(self, chunk_ms: int) -> Iterator[Tuple[float, memoryview]]:
+        """Yield (offset seconds, zero-copy view) pairs of chunk_ms audio"""
+        frames_per_chunk = max(1, self.sample_rate * chunk_ms // 1000)
+        step = frames_per_chunk * self.frame_size
+        end = self.data_offset + self.data_length
+        for start in range(self.data_offset, end, step):
+            offset = (start - self.data_offset) / (self.sample_rate * self.frame_size)
+            yield offset, self._view[start:min(start + step, end)]
+
+    def close(self) -> None:
+        """Release the mapping"""
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            logger.debug(f"Chunks of {self.path} still referenced, deferring unmap")
+        self._file.close()
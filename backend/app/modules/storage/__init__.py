@@ -3,14 +3,115 @@ Storage Module
 Local-first data persistence
 """
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from typing import List, Optional
 from dataclasses import dataclass
 from datetime import datetime
+from pathlib import Path
+import asyncio
+import json
 import logging
+import time
+
+import aiosqlite
+
+from app.core.crypto import decrypt_field, encrypt_field, load_storage_key
+from app.modules.transcription import TranscriptSegment
 
 logger = logging.getLogger(__name__)
 
 
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    id TEXT PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    ended_at TEXT,
+    duration REAL,
+    transcript TEXT NOT NULL DEFAULT '',
+    analysis TEXT NOT NULL DEFAULT '{}',
+    metadata TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_calls_started_at ON calls (started_at);
+
+CREATE TABLE IF NOT EXISTS transcript_segments (
+    call_id TEXT NOT NULL,
+    start_time REAL NOT NULL,
+    end_time REAL NOT NULL,
+    text TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    speaker TEXT,
+    PRIMARY KEY (call_id, start_time)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS audio_files (
+    call_id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    state TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL DEFAULT 0,
+    duration REAL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_audio_files_created_at ON audio_files (created_at);
+
+CREATE TABLE IF NOT EXISTS sentiment_points (
+    call_id TEXT NOT NULL,
+    t REAL NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (call_id, t)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS sentiment_rollups (
+    call_id TEXT NOT NULL,
+    width INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    total REAL NOT NULL,
+    min REAL NOT NULL,
+    max REAL NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (call_id, width, bucket)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS call_metrics (
+    call_id TEXT PRIMARY KEY,
+    day TEXT NOT NULL,
+    dimensions TEXT NOT NULL,
+    talk_ratio REAL NOT NULL,
+    questions_asked INTEGER NOT NULL,
+    average_sentiment REAL NOT NULL,
+    duration REAL NOT NULL,
+    keywords TEXT NOT NULL DEFAULT '[]'
+);
+
+CREATE TABLE IF NOT EXISTS analytics_rollups (
+    period TEXT NOT NULL,
+    bucket_start TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    value TEXT NOT NULL,
+    calls INTEGER NOT NULL,
+    talk_ratio_sum REAL NOT NULL,
+    questions_sum INTEGER NOT NULL,
+    sentiment_sum REAL NOT NULL,
+    duration_sum REAL NOT NULL,
+    PRIMARY KEY (period, dimension, value, bucket_start)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_analytics_rollups_bucket
+    ON analytics_rollups (period, dimension, bucket_start);
+
+CREATE TABLE IF NOT EXISTS analytics_keywords (
+    period TEXT NOT NULL,
+    bucket_start TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    value TEXT NOT NULL,
+    word TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (period, dimension, value, bucket_start, word)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_analytics_keywords_bucket
+    ON analytics_keywords (period, dimension, bucket_start);
+"""
+
+
 @dataclass
 class CallData:
     """Complete call data"""
@@ -23,24 +124,42 @@ class CallData:
     metadata: dict
 
 
+def sqlite_path(database_url: str) -> str:
+    """Extract the filesystem path from a sqlite:/// database URL"""
+    prefix = "sqlite:///"
+    if not database_url.startswith(prefix):
+        raise ValueError(f"Unsupported database URL: {database_url}")
+    return database_url[len(prefix):]
+
+
 class StorageInterface(ABC):
     """Abstract interface for storage"""
-    
+
     @abstractmethod
     async def save_call(self, call_data: CallData) -> str:
         """Save call data"""
         pass
-    
+
     @abstractmethod
     async def get_call(self, call_id: str) -> Optional[CallData]:
         """Retrieve call data"""
         pass
-    
+
+    @abstractmethod
+    async def save_segments(self, call_id: str, segments: List[TranscriptSegment]) -> None:
+        """Save transcript segments for a call"""
+        pass
+
+    @abstractmethod
+    async def get_segments(self, call_id: str) -> List[TranscriptSegment]:
+        """Retrieve transcript segments for a call"""
+        pass
+
     @abstractmethod
     async def list_calls(self, limit: int = 50, offset: int = 0) -> List[CallData]:
         """List calls"""
         pass
-    
+
     @abstractmethod
     async def delete_call(self, call_id: str) -> bool:
         """Delete call"""
@@ -49,40 +168,223 @@ class StorageInterface(ABC):
 
 class StorageModule(StorageInterface):
     """SQLite-based storage implementation"""
-    
-    def __init__(self):
-        self.db = None
+
+    def __init__(self, database_url: Optional[str] = None):
+        self.database_url = database_url
+        self.path: Optional[str] = None
+        self.key: Optional[bytes] = None
+        self.db: Optional[aiosqlite.Connection] = None
+        self.max_commit_ms = 0.0
+        # Held for the whole of every write transaction on the shared connection
+        self.write_lock = asyncio.Lock()
+        # Set by AudioStorageManager.start() so deleted calls lose their audio
+        self.audio = None
         logger.info("StorageModule initialized")
-    
+
     async def initialize(self):
         """Initialize database connection"""
-        # TODO: Initialize SQLite database
-        logger.info("Database initialized")
-    
+        from app.core.config import settings
+
+        path = sqlite_path(self.database_url or settings.DATABASE_URL)
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = path
+        self.key = load_storage_key()
+        self.db = await aiosqlite.connect(path)
+        self.db.row_factory = aiosqlite.Row
+        # WAL keeps readers (API queries, purge scans) from blocking the writer
+        await self.db.execute("PRAGMA journal_mode=WAL")
+        await self.db.execute("PRAGMA synchronous=NORMAL")
+        async with self.transaction() as db:
+            await db.executescript(SCHEMA)
+        logger.info(f"Database initialized: {path}")
+
+    async def close(self):
+        """Close database connection"""
+        if self.db is not None:
+            await self.db.close()
+            self.db = None
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Run a write transaction while holding the storage write lock
+
+        Every store writes through this one connection, so a commit or
+        rollback issued by one coroutine would otherwise also cover another
+        coroutine's half-finished statements. Holding the lock from the first
+        statement to the commit keeps each transaction to its own writes.
+        """
+        async with self.write_lock:
+            try:
+                yield self.db
+            except BaseException:
+                await self.db.rollback()
+                raise
+            await self.commit()
+
+    async def commit(self) -> None:
+        """Commit the current write transaction, tracking the slowest commit
+
+        Only call this while holding write_lock; transaction() does so.
+        """
+        started = time.perf_counter()
+        await self.db.commit()
+        self.max_commit_ms = max(self.max_commit_ms, (time.perf_counter() - started) * 1000)
+
+    def reset_commit_stats(self) -> float:
+        """Return the slowest commit since the last reset and start a new window"""
+        slowest, self.max_commit_ms = self.max_commit_ms, 0.0
+        return slowest
+
+    async def connect_readonly(self) -> aiosqlite.Connection:
+        """Open a separate read-only connection for long-running scans
+
+        In WAL mode the scan reads a consistent snapshot and neither blocks
+        nor is blocked by writes on the main connection.
+        """
+        db = await aiosqlite.connect(f"file:{self.path}?mode=ro", uri=True)
+        db.row_factory = aiosqlite.Row
+        return db
+
+    def encrypt_text(self, value: str, column: str, call_id: str) -> str:
+        """Encrypt transcript text when encryption at rest is enabled
+
+        The ciphertext is bound to `column` (e.g. "calls.transcript") and the
+        call it belongs to.
+        """
+        return encrypt_field(value, self.key, f"{column}:{call_id}")
+
+    def decrypt_text(self, value: Optional[str], column: str, call_id: str) -> Optional[str]:
+        """Decrypt transcript text (plaintext rows pass through)"""
+        return decrypt_field(value, self.key, f"{column}:{call_id}")
+
+    def _row_to_call(self, row: aiosqlite.Row) -> CallData:
+        return CallData(
+            id=row["id"],
+            started_at=datetime.fromisoformat(row["started_at"]),
+            ended_at=datetime.fromisoformat(row["ended_at"]) if row["ended_at"] else None,
+            duration=row["duration"],
+            transcript=self.decrypt_text(row["transcript"], "calls.transcript", row["id"]),
+            analysis=json.loads(row["analysis"]),
+            metadata=json.loads(row["metadata"])
+        )
+
     async def save_call(self, call_data: CallData) -> str:
         """Save call data"""
-        # TODO: Implement database save
         logger.info(f"Saving call: {call_data.id}")
+        async with self.transaction() as db:
+            await db.execute(
+                """
+                INSERT INTO calls (id, started_at, ended_at, duration, transcript, analysis, metadata)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    started_at = excluded.started_at,
+                    ended_at = excluded.ended_at,
+                    duration = excluded.duration,
+                    transcript = excluded.transcript,
+                    analysis = excluded.analysis,
+                    metadata = excluded.metadata
+                """,
+                (
+                    call_data.id,
+                    call_data.started_at.isoformat(),
+                    call_data.ended_at.isoformat() if call_data.ended_at else None,
+                    call_data.duration,
+                    self.encrypt_text(call_data.transcript, "calls.transcript", call_data.id),
+                    json.dumps(call_data.analysis),
+                    json.dumps(call_data.metadata)
+                )
+            )
         return call_data.id
-    
+
     async def get_call(self, call_id: str) -> Optional[CallData]:
         """Retrieve call data"""
-        # TODO: Implement database retrieval
         logger.info(f"Getting call: {call_id}")
-        return None
-    
+        async with self.db.execute("SELECT * FROM calls WHERE id = ?", (call_id,)) as cursor:
+            row = await cursor.fetchone()
+        return self._row_to_call(row) if row else None
+
+    async def is_call_finished(self, call_id: str) -> Optional[bool]:
+        """Whether a call has ended, read without loading or decrypting it
+
+        Returns None when the call does not exist.
+        """
+        async with self.db.execute("SELECT ended_at FROM calls WHERE id = ?", (call_id,)) as cursor:
+            row = await cursor.fetchone()
+        return None if row is None else row["ended_at"] is not None
+
+    async def save_segments(self, call_id: str, segments: List[TranscriptSegment]) -> None:
+        """Save transcript segments for a call"""
+        async with self.transaction() as db:
+            await db.executemany(
+                """
+                INSERT OR REPLACE INTO transcript_segments
+                    (call_id, start_time, end_time, text, confidence, speaker)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        call_id, s.start_time, s.end_time,
+                        self.encrypt_text(s.text, "transcript_segments.text", call_id),
+                        s.confidence, s.speaker
+                    )
+                    for s in segments
+                ]
+            )
+
+    async def get_segments(self, call_id: str) -> List[TranscriptSegment]:
+        """Retrieve transcript segments for a call, in time order"""
+        async with self.db.execute(
+            "SELECT * FROM transcript_segments WHERE call_id = ? ORDER BY start_time",
+            (call_id,)
+        ) as cursor:
+            rows = await cursor.fetchall()
+        return [
+            TranscriptSegment(
+                text=self.decrypt_text(r["text"], "transcript_segments.text", call_id),
+                start_time=r["start_time"],
+                end_time=r["end_time"],
+                confidence=r["confidence"],
+                speaker=r["speaker"]
+            )
+            for r in rows
+        ]
+
     async def list_calls(self, limit: int = 50, offset: int = 0) -> List[CallData]:
         """List calls"""
-        # TODO: Implement database query
         logger.info(f"Listing calls: limit={limit}, offset={offset}")
-        return []
-    
+        async with self.db.execute(
+            "SELECT * FROM calls ORDER BY started_at DESC LIMIT ? OFFSET ?",
+            (limit, offset)
+        ) as cursor:
+            rows = await cursor.fetchall()
+        return [self._row_to_call(row) for row in rows]
+
     async def delete_call(self, call_id: str) -> bool:
         """Delete call"""
-        # TODO: Implement database deletion
         logger.info(f"Deleting call: {call_id}")
-        return True
+        async with self.transaction() as db:
+            cursor = await db.execute("DELETE FROM calls WHERE id = ?", (call_id,))
+            await db.execute("DELETE FROM transcript_segments WHERE call_id = ?", (call_id,))
+            await db.execute("DELETE FROM sentiment_points WHERE call_id = ?", (call_id,))
+            await db.execute("DELETE FROM sentiment_rollups WHERE call_id = ?", (call_id,))
+            await AnalyticsRollupStore(self).remove_call(call_id, commit=False)
+            audio = await db.execute("DELETE FROM audio_files WHERE call_id = ?", (call_id,))
+        if audio.rowcount and self.audio is not None:
+            await self.audio.remove_files(call_id)
+        return cursor.rowcount > 0
 
 
 # Global instance
 storage = StorageModule()
+
+from app.modules.storage.audio import AudioStorageManager  # noqa: E402
+from app.modules.storage.sentiment import SentimentSeriesStore  # noqa: E402
+from app.modules.storage.analytics import AnalyticsRollupStore  # noqa: E402
+from app.modules.storage.backup import BackupManager  # noqa: E402
+
+audio_storage = AudioStorageManager(storage)
+sentiment_series = SentimentSeriesStore(storage)
+analytics_rollups = AnalyticsRollupStore(storage)
+backup_manager = BackupManager(storage)
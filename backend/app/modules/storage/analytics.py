@@ -0,0 +1,220 @@
+"""
+Analytics Rollups
+Incrementally maintained cross-call aggregates for dashboards
+"""
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import json
+import logging
+
+from app.modules.analysis import CallMetrics, Keyword
+
+logger = logging.getLogger(__name__)
+
+PERIODS = ("day", "week")
+DIMENSIONS = ("all", "rep", "tag")
+KEYWORDS_PER_CALL = 20
+
+
+@dataclass
+class AnalyticsBucket:
+    """Aggregated metrics for one period bucket and dimension value"""
+    period: str
+    bucket_start: date
+    dimension: str
+    value: str
+    calls: int
+    avg_talk_ratio: float
+    avg_questions: float
+    avg_sentiment: float
+    total_duration: float
+    top_keywords: List[Tuple[str, int]] = field(default_factory=list)
+
+
+def bucket_start(day: date, period: str) -> date:
+    """First day of the bucket containing `day` (weeks start on Monday)"""
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def dimension_values(metadata: dict) -> List[Tuple[str, str]]:
+    """Distinct dimension values a call contributes to"""
+    values = [("all", "*")]
+    if metadata.get("rep"):
+        values.append(("rep", str(metadata["rep"])))
+    for tag in metadata.get("tags") or []:
+        values.append(("tag", str(tag)))
+    # A repeated tag must not count the call twice in the same bucket
+    return list(dict.fromkeys(values))
+
+
+class AnalyticsRollupStore:
+    """Daily and weekly aggregates by rep and metadata tag
+
+    Every finalized call adds its metrics to one row per (period, dimension
+    value) and remembers what it contributed in `call_metrics`, so
+    re-finalizing or deleting a call subtracts exactly that contribution.
+    Dashboard queries then read O(buckets) rows instead of every call.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+
+    async def finalize_call(self, call_id: str, started_at: datetime, metadata: dict,
+                            metrics: CallMetrics, keywords: List[Keyword]) -> None:
+        """Record final metrics for a call and update the rollups"""
+        top = sorted(keywords, key=lambda k: k.count, reverse=True)[:KEYWORDS_PER_CALL]
+        row = {
+            "call_id": call_id,
+            "day": started_at.date().isoformat(),
+            "dimensions": json.dumps(dimension_values(metadata)),
+            "talk_ratio": metrics.talk_ratio,
+            "questions_asked": metrics.questions_asked,
+            "average_sentiment": metrics.average_sentiment,
+            "duration": metrics.duration,
+            "keywords": json.dumps([[k.word, k.count] for k in top])
+        }
+        async with self.storage.transaction() as db:
+            await self.remove_call(call_id, commit=False)
+            await db.execute(
+                """
+                INSERT INTO call_metrics (call_id, day, dimensions, talk_ratio, questions_asked,
+                                          average_sentiment, duration, keywords)
+                VALUES (:call_id, :day, :dimensions, :talk_ratio, :questions_asked,
+                        :average_sentiment, :duration, :keywords)
+                """,
+                row
+            )
+            await self._apply(row, 1)
+        logger.info(f"Updated analytics rollups for call: {call_id}")
+
+    async def remove_call(self, call_id: str, commit: bool = True) -> bool:
+        """Subtract a call's contribution from the rollups
+
+        With commit=False the caller must already hold a storage
+        transaction, which this then joins.
+        """
+        if commit:
+            async with self.storage.transaction():
+                return await self.remove_call(call_id, commit=False)
+
+        db = self.storage.db
+        async with db.execute("SELECT * FROM call_metrics WHERE call_id = ?", (call_id,)) as cursor:
+            row = await cursor.fetchone()
+        if row is None:
+            return False
+        await self._apply(dict(row), -1)
+        await db.execute("DELETE FROM call_metrics WHERE call_id = ?", (call_id,))
+        return True
+
+    async def _apply(self, row: dict, sign: int) -> None:
+        day = date.fromisoformat(row["day"])
+        dimensions = json.loads(row["dimensions"])
+        keywords = json.loads(row["keywords"])
+        keys = [
+            (period, bucket_start(day, period).isoformat(), dimension, value)
+            for period in PERIODS
+            for dimension, value in dimensions
+        ]
+        await self.storage.db.executemany(
+            """
+            INSERT INTO analytics_rollups (period, bucket_start, dimension, value, calls,
+                                           talk_ratio_sum, questions_sum, sentiment_sum, duration_sum)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(period, dimension, value, bucket_start) DO UPDATE SET
+                calls = calls + excluded.calls,
+                talk_ratio_sum = talk_ratio_sum + excluded.talk_ratio_sum,
+                questions_sum = questions_sum + excluded.questions_sum,
+                sentiment_sum = sentiment_sum + excluded.sentiment_sum,
+                duration_sum = duration_sum + excluded.duration_sum
+            """,
+            [
+                (*key, sign, sign * row["talk_ratio"], sign * row["questions_asked"],
+                 sign * row["average_sentiment"], sign * row["duration"])
+                for key in keys
+            ]
+        )
+        await self.storage.db.executemany(
+            """
+            INSERT INTO analytics_keywords (period, bucket_start, dimension, value, word, count)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(period, dimension, value, bucket_start, word) DO UPDATE SET
+                count = count + excluded.count
+            """,
+            [(*key, word, sign * count) for key in keys for word, count in keywords]
+        )
+        if sign < 0:
+            # Drop rows this removal emptied, by primary key rather than a table scan
+            await self.storage.db.executemany(
+                """
+                DELETE FROM analytics_rollups
+                WHERE period = ? AND bucket_start = ? AND dimension = ? AND value = ? AND calls <= 0
+                """,
+                keys
+            )
+            await self.storage.db.executemany(
+                """
+                DELETE FROM analytics_keywords
+                WHERE period = ? AND bucket_start = ? AND dimension = ? AND value = ?
+                    AND word = ? AND count <= 0
+                """,
+                [(*key, word) for key in keys for word, _ in keywords]
+            )
+
+    async def query(self, period: str, dimension: str, start: date, end: date,
+                    value: Optional[str] = None, top_keywords: int = 5) -> List[AnalyticsBucket]:
+        """Read aggregated buckets in [start, end]"""
+        if period not in PERIODS:
+            raise ValueError(f"Unknown period: {period}")
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension: {dimension}")
+
+        where = "period = ? AND dimension = ? AND bucket_start >= ? AND bucket_start <= ?"
+        params = [period, dimension, bucket_start(start, period).isoformat(), end.isoformat()]
+        if value is not None:
+            where += " AND value = ?"
+            params.append(value)
+
+        db = self.storage.db
+        async with db.execute(
+            f"SELECT * FROM analytics_rollups WHERE {where} ORDER BY bucket_start, value", params
+        ) as cursor:
+            rows = await cursor.fetchall()
+
+        keywords: Dict[Tuple[str, str], List[Tuple[str, int]]] = {}
+        if top_keywords > 0:
+            # Rank within each bucket in SQL so only top_keywords rows per bucket come back
+            async with db.execute(
+                f"""
+                SELECT bucket_start, value, word, count FROM (
+                    SELECT bucket_start, value, word, count, ROW_NUMBER() OVER (
+                        PARTITION BY bucket_start, value ORDER BY count DESC, word
+                    ) AS rank
+                    FROM analytics_keywords WHERE {where}
+                ) WHERE rank <= ?
+                ORDER BY bucket_start, value, rank
+                """,
+                [*params, top_keywords]
+            ) as cursor:
+                for r in await cursor.fetchall():
+                    keywords.setdefault((r["bucket_start"], r["value"]), []).append((r["word"], r["count"]))
+
+        buckets = []
+        for r in rows:
+            calls = r["calls"]
+            words = keywords.get((r["bucket_start"], r["value"]), [])
+            buckets.append(AnalyticsBucket(
+                period=period,
+                bucket_start=date.fromisoformat(r["bucket_start"]),
+                dimension=dimension,
+                value=r["value"],
+                calls=calls,
+                avg_talk_ratio=r["talk_ratio_sum"] / calls,
+                avg_questions=r["questions_sum"] / calls,
+                avg_sentiment=r["sentiment_sum"] / calls,
+                total_duration=r["duration_sum"],
+                top_keywords=words
+            ))
+        return buckets
@@ -0,0 +1,474 @@
+"""
+Audio Storage
+Segmented live recording, background archiving and retention purge
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+import asyncio
+import logging
+import os
+import re
+import shutil
+import struct
+
+from app.core.crypto import (
+    DEFAULT_BLOCK_SIZE, ENCRYPTED_SUFFIX, HEADER_SIZE, TAG_SIZE,
+    EncryptedWriter, encrypt_file, load_storage_key, open_for_read
+)
+from app.modules.storage.waveform import build_peak_pyramid
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2  # pcm16
+CHANNELS = 1
+
+# Audio file lifecycle states
+STATE_LIVE = "live"          # segments still being appended
+STATE_PENDING = "pending"    # call finished, waiting for the archive worker
+STATE_ARCHIVED = "archived"  # transcoded to a single compressed file
+STATE_RAW = "raw"            # archiving failed, segments kept as-is
+
+ARCHIVE_EXTENSIONS = {"flac": ".flac", "opus": ".opus", "wav": ".wav"}
+
+_CALL_ID_PATTERN = re.compile(r"^[A-Za-z0-9_\-]+$")
+
+
+@dataclass
+class AudioFileInfo:
+    """Stored audio for a call"""
+    call_id: str
+    path: str
+    codec: str
+    state: str
+    size_bytes: int
+    duration: Optional[float]
+    created_at: datetime
+
+
+@dataclass
+class DiskUsage:
+    """Audio disk usage summary"""
+    total_bytes: int = 0
+    file_count: int = 0
+    by_state: Dict[str, int] = field(default_factory=dict)
+
+
+class SegmentWriter:
+    """Append-only writer splitting live audio into fixed-length segment files"""
+
+    def __init__(self, directory: Path, segment_bytes: int, key: Optional[bytes] = None):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.key = key
+        self.segments: List[Path] = []
+        self.bytes_written = 0
+        self._file = None
+        self._current_bytes = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _roll(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        path = self.directory / f"{len(self.segments):06d}.pcm"
+        if self.key is not None:
+            # Encrypted as it is written, so plaintext never reaches disk
+            path = path.with_name(path.name + ENCRYPTED_SUFFIX)
+            self._file = EncryptedWriter(path, self.key)
+        else:
+            self._file = open(path, "ab")
+        self._current_bytes = 0
+        self.segments.append(path)
+
+    def write(self, data: bytes) -> None:
+        """Append PCM data, starting a new segment when the current one is full"""
+        view = memoryview(data)
+        while view:
+            if self._file is None or self._current_bytes >= self.segment_bytes:
+                self._roll()
+            room = self.segment_bytes - self._current_bytes
+            self._file.write(view[:room])
+            written = min(room, len(view))
+            self._current_bytes += written
+            self.bytes_written += written
+            view = view[written:]
+
+    def close(self) -> List[Path]:
+        """Close the current segment and return all segment paths"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return self.segments
+
+
+def _lower_thread_priority() -> None:
+    """Run archive work at reduced CPU priority (per-thread on Linux)"""
+    try:
+        os.nice(10)
+    except (AttributeError, OSError):
+        pass
+
+
+def segment_paths(directory: Path) -> List[Path]:
+    """Segment files of a call in recording order"""
+    return sorted(directory.glob("*.pcm")) + sorted(directory.glob("*.pcm" + ENCRYPTED_SUFFIX))
+
+
+def pcm_size(path: Path) -> int:
+    """Plaintext size of a segment file"""
+    if path.name.endswith(ENCRYPTED_SUFFIX):
+        # Header plus one tag per block; no key needed to compute the size
+        stored = path.stat().st_size
+        blocks = max(1, -(-(stored - HEADER_SIZE) // (DEFAULT_BLOCK_SIZE + TAG_SIZE)))
+        return max(0, stored - HEADER_SIZE - blocks * TAG_SIZE)
+    return path.stat().st_size
+
+
+def archive_codec(path: Path) -> str:
+    """Codec of an archive file, ignoring the encryption suffix"""
+    name = path.name
+    if name.endswith(ENCRYPTED_SUFFIX):
+        name = name[:-len(ENCRYPTED_SUFFIX)]
+    return Path(name).suffix.lstrip(".")
+
+
+def _wav_header(data_bytes: int) -> bytes:
+    """Canonical 44-byte WAV header, so WAV can be streamed without seeking"""
+    byte_rate = SAMPLE_RATE * SAMPLE_WIDTH * CHANNELS
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_bytes, b"WAVE", b"fmt ", 16, 1, CHANNELS, SAMPLE_RATE,
+        byte_rate, SAMPLE_WIDTH * CHANNELS, SAMPLE_WIDTH * 8, b"data", data_bytes
+    )
+
+
+def _open_segments(segments: List[Path], key: Optional[bytes]) -> list:
+    # Recover mode keeps every sealed block of a segment whose writer was
+    # never closed (e.g. after a crash) instead of failing the whole call
+    readers = []
+    try:
+        for segment in segments:
+            readers.append(open_for_read(segment, key, recover=True))
+    except Exception:
+        for reader in readers:
+            reader.close()
+        raise
+    return readers
+
+
+def _reader_size(reader) -> int:
+    return reader.size if hasattr(reader, "size") else os.fstat(reader.fileno()).st_size
+
+
+def transcode_segments(segments: List[Path], output: Path, codec: str,
+                       key: Optional[bytes] = None) -> Path:
+    """Concatenate raw PCM segments into a single archive file
+
+    Streams segment by segment so memory stays bounded for long calls.
+    Falls back to WAV when soundfile is not installed. With a key, WAV is
+    encrypted as it is written; FLAC and Opus need a seekable plaintext
+    file while encoding, which is removed on every path once sealed.
+    """
+    sf = None
+    if codec != "wav":
+        try:
+            import soundfile as sf
+        except ImportError:
+            logger.warning("soundfile not installed, archiving audio as WAV")
+            codec = "wav"
+    output = output.with_suffix(ARCHIVE_EXTENSIONS[codec])
+    if key is not None:
+        output = output.with_name(output.name + ENCRYPTED_SUFFIX)
+    tmp = output.with_name(output.name + ".tmp")
+    plain_tmp = output.with_name(output.name + ".plain.tmp")
+
+    readers = _open_segments(segments, key)
+    try:
+        if codec == "wav":
+            data_bytes = sum(_reader_size(r) for r in readers)
+            data_bytes -= data_bytes % SAMPLE_WIDTH
+            with (EncryptedWriter(tmp, key) if key is not None else open(tmp, "wb")) as out:
+                out.write(_wav_header(data_bytes))
+                remaining = data_bytes
+                for reader in readers:
+                    while remaining and (block := reader.read(min(1 << 20, remaining))):
+                        out.write(block)
+                        remaining -= len(block)
+        else:
+            import numpy as np
+
+            encoded = plain_tmp if key is not None else tmp
+            fmt, subtype = ("FLAC", "PCM_16") if codec == "flac" else ("OGG", "OPUS")
+            with sf.SoundFile(str(encoded), "w", samplerate=SAMPLE_RATE, channels=CHANNELS,
+                              format=fmt, subtype=subtype) as out:
+                for reader in readers:
+                    while block := reader.read(1 << 20):
+                        usable = len(block) - len(block) % SAMPLE_WIDTH
+                        out.write(np.frombuffer(block[:usable], dtype="<i2"))
+            if key is not None:
+                encrypt_file(encoded, tmp, key)
+        os.replace(tmp, output)
+    finally:
+        for reader in readers:
+            reader.close()
+        for leftover in (tmp, plain_tmp):
+            leftover.unlink(missing_ok=True)
+    return output
+
+
+class AudioStorageManager:
+    """Stores call audio under AUDIO_STORAGE_PATH and enforces retention"""
+
+    def __init__(self, storage, base_path: Optional[str] = None, codec: Optional[str] = None):
+        self.storage = storage
+        self._base_path = base_path
+        self._codec = codec
+        self.base_path: Optional[Path] = None
+        self.codec: Optional[str] = None
+        self.segment_bytes = 0
+        self.key: Optional[bytes] = None
+        self.writers: Dict[str, SegmentWriter] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks: List[asyncio.Task] = []
+        logger.info("AudioStorageManager initialized")
+
+    async def start(self, schedule_purge: bool = True) -> None:
+        """Start the archive worker and (optionally) the purge scheduler"""
+        from app.core.config import settings
+
+        self.base_path = Path(self._base_path or settings.AUDIO_STORAGE_PATH)
+        self.codec = (self._codec or settings.AUDIO_ARCHIVE_CODEC).lower()
+        if self.codec not in ARCHIVE_EXTENSIONS:
+            raise ValueError(f"Unsupported audio archive codec: {self.codec}")
+        self.segment_bytes = settings.AUDIO_SEGMENT_SECONDS * SAMPLE_RATE * SAMPLE_WIDTH * CHANNELS
+        if self.segment_bytes <= 0:
+            raise ValueError(f"AUDIO_SEGMENT_SECONDS must be positive: {settings.AUDIO_SEGMENT_SECONDS}")
+        if settings.AUDIO_PURGE_INTERVAL_MINUTES <= 0:
+            raise ValueError(
+                f"AUDIO_PURGE_INTERVAL_MINUTES must be positive: {settings.AUDIO_PURGE_INTERVAL_MINUTES}"
+            )
+        self.base_path.mkdir(parents=True, exist_ok=True)
+        self.key = load_storage_key()
+
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="audio-archive",
+            initializer=_lower_thread_priority
+        )
+        self._tasks.append(asyncio.create_task(self._archive_worker()))
+        if schedule_purge:
+            self._tasks.append(asyncio.create_task(self._purge_scheduler()))
+
+        # Re-queue calls interrupted by a restart
+        async with self.storage.db.execute(
+            "SELECT call_id FROM audio_files WHERE state IN (?, ?)",
+            (STATE_LIVE, STATE_PENDING)
+        ) as cursor:
+            for row in await cursor.fetchall():
+                await self._mark_pending(row["call_id"])
+        self.storage.audio = self
+        logger.info(f"Audio storage started: {self.base_path} ({self.codec})")
+
+    async def stop(self) -> None:
+        """Stop background tasks and close open writers"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for writer in self.writers.values():
+            writer.close()
+        self.writers = {}
+        if self.storage.audio is self:
+            self.storage.audio = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def call_dir(self, call_id: str) -> Path:
+        """Directory holding all audio for a call"""
+        if not _CALL_ID_PATTERN.match(call_id):
+            raise ValueError(f"Invalid call id: {call_id}")
+        return self.base_path / call_id
+
+    def waveform_dir(self, call_id: str) -> Path:
+        """Directory holding the waveform peak pyramid for a call"""
+        return self.call_dir(call_id) / "waveform"
+
+    async def get_audio_file(self, call_id: str) -> Optional[AudioFileInfo]:
+        """Look up stored audio for a call"""
+        async with self.storage.db.execute(
+            "SELECT * FROM audio_files WHERE call_id = ?", (call_id,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+        return AudioFileInfo(
+            call_id=row["call_id"],
+            path=row["path"],
+            codec=row["codec"],
+            state=row["state"],
+            size_bytes=row["size_bytes"],
+            duration=row["duration"],
+            created_at=datetime.fromisoformat(row["created_at"])
+        )
+
+    async def open_call(self, call_id: str) -> None:
+        """Start recording audio for a live call"""
+        directory = self.call_dir(call_id)
+        self.writers[call_id] = SegmentWriter(directory / "segments", self.segment_bytes, self.key)
+        async with self.storage.transaction() as db:
+            await db.execute(
+                """
+                INSERT OR REPLACE INTO audio_files (call_id, path, codec, state, size_bytes, created_at)
+                VALUES (?, ?, 'pcm16', ?, 0, ?)
+                """,
+                (call_id, str(directory), STATE_LIVE, datetime.now().isoformat())
+            )
+        logger.info(f"Recording audio for call: {call_id}")
+
+    async def write(self, call_id: str, data: bytes) -> None:
+        """Append a chunk of live PCM audio"""
+        writer = self.writers.get(call_id)
+        if writer is None:
+            raise KeyError(f"No open audio for call: {call_id}")
+        writer.write(data)
+
+    async def finish_call(self, call_id: str) -> None:
+        """Close live segments and queue the call for archiving"""
+        writer = self.writers.pop(call_id, None)
+        if writer is None:
+            raise KeyError(f"No open audio for call: {call_id}")
+        writer.close()
+        await self._mark_pending(call_id)
+
+    async def _mark_pending(self, call_id: str) -> None:
+        directory = self.call_dir(call_id)
+        segments = segment_paths(directory / "segments")
+        size = sum(p.stat().st_size for p in segments)
+        pcm_bytes = sum(pcm_size(p) for p in segments)
+        async with self.storage.transaction() as db:
+            await db.execute(
+                "UPDATE audio_files SET state = ?, size_bytes = ?, duration = ? WHERE call_id = ?",
+                (STATE_PENDING, size, pcm_bytes / (SAMPLE_RATE * SAMPLE_WIDTH * CHANNELS), call_id)
+            )
+        await self._queue.put(call_id)
+
+    async def join(self) -> None:
+        """Wait until all queued calls have been archived"""
+        await self._queue.join()
+
+    async def _archive_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            call_id = await self._queue.get()
+            try:
+                await self._archive(loop, call_id)
+            except Exception as e:
+                logger.error(f"Failed to archive audio for {call_id}: {e}")
+                async with self.storage.transaction() as db:
+                    await db.execute(
+                        "UPDATE audio_files SET state = ? WHERE call_id = ?",
+                        (STATE_RAW, call_id)
+                    )
+            finally:
+                self._queue.task_done()
+
+    async def _archive(self, loop: asyncio.AbstractEventLoop, call_id: str) -> None:
+        directory = self.call_dir(call_id)
+        segment_dir = directory / "segments"
+        segments = segment_paths(segment_dir)
+        output = await loop.run_in_executor(
+            self._executor, transcode_segments, segments, directory / "audio", self.codec, self.key
+        )
+        # Peaks are computed once here, from the raw PCM, before it is removed
+        await loop.run_in_executor(
+            self._executor, build_peak_pyramid, segments, self.waveform_dir(call_id), self.key
+        )
+        async with self.storage.transaction() as db:
+            await db.execute(
+                "UPDATE audio_files SET path = ?, codec = ?, state = ?, size_bytes = ? WHERE call_id = ?",
+                (str(output), archive_codec(output), STATE_ARCHIVED, output.stat().st_size, call_id)
+            )
+        await loop.run_in_executor(self._executor, shutil.rmtree, segment_dir)
+        logger.info(f"Archived audio for call {call_id}: {output.name}")
+
+    async def remove_files(self, call_id: str) -> None:
+        """Delete all audio files for a call, including its waveform
+
+        The caller removes the audio_files row; a live writer is closed first.
+        """
+        writer = self.writers.pop(call_id, None)
+        if writer is not None:
+            writer.close()
+        await asyncio.to_thread(shutil.rmtree, self.call_dir(call_id), True)
+        logger.info(f"Removed audio for call: {call_id}")
+
+    async def purge_expired(self, now: Optional[datetime] = None) -> int:
+        """Delete audio older than AUTO_DELETE_AUDIO_DAYS
+
+        Works in small batches with one short transaction each, so live
+        writers never wait long on the database lock.
+        """
+        from app.core.config import settings
+
+        cutoff = (now or datetime.now()) - timedelta(days=settings.AUTO_DELETE_AUDIO_DAYS)
+        batch_size = settings.AUDIO_PURGE_BATCH_SIZE
+        purged = 0
+        while True:
+            async with self.storage.db.execute(
+                """
+                SELECT call_id FROM audio_files
+                WHERE created_at < ? AND state NOT IN (?, ?)
+                ORDER BY created_at LIMIT ?
+                """,
+                (cutoff.isoformat(), STATE_LIVE, STATE_PENDING, batch_size)
+            ) as cursor:
+                call_ids = [row["call_id"] for row in await cursor.fetchall()]
+            if not call_ids:
+                break
+
+            for call_id in call_ids:
+                await asyncio.to_thread(shutil.rmtree, self.call_dir(call_id), True)
+            placeholders = ",".join("?" * len(call_ids))
+            async with self.storage.transaction() as db:
+                await db.execute(
+                    f"DELETE FROM audio_files WHERE call_id IN ({placeholders})", call_ids
+                )
+            purged += len(call_ids)
+            await asyncio.sleep(0)
+
+        if purged:
+            logger.info(f"Purged expired audio for {purged} calls")
+        return purged
+
+    async def _purge_scheduler(self) -> None:
+        from app.core.config import settings
+
+        while True:
+            try:
+                await self.purge_expired()
+            except Exception as e:
+                logger.error(f"Audio purge failed: {e}")
+            await asyncio.sleep(settings.AUDIO_PURGE_INTERVAL_MINUTES * 60)
+
+    async def get_disk_usage(self) -> DiskUsage:
+        """Disk usage from the audio index, without walking the filesystem"""
+        usage = DiskUsage()
+        async with self.storage.db.execute(
+            "SELECT state, COUNT(*) AS n, SUM(size_bytes) AS bytes FROM audio_files GROUP BY state"
+        ) as cursor:
+            for row in await cursor.fetchall():
+                usage.by_state[row["state"]] = row["bytes"] or 0
+                usage.total_bytes += row["bytes"] or 0
+                usage.file_count += row["n"]
+        # Live calls are accounted from their writers
+        live_bytes = sum(w.bytes_written for w in self.writers.values())
+        if live_bytes:
+            usage.by_state[STATE_LIVE] = usage.by_state.get(STATE_LIVE, 0) + live_bytes
+            usage.total_bytes += live_bytes
+        return usage
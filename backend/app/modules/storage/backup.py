@@ -0,0 +1,172 @@
+"""
+Database Backup
+Online SQLite backups in small page steps with rotation-based retention
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+
+logger = logging.getLogger(__name__)
+
+BACKUP_PREFIX = "nanalyzer-"
+BACKUP_SUFFIX = ".db"
+
+
+@dataclass
+class BackupReport:
+    """Outcome of a single backup run"""
+    path: str
+    started_at: datetime
+    duration_ms: float
+    pages: int
+    steps: int
+    max_step_ms: float
+    max_writer_stall_ms: float
+    size_bytes: int
+
+
+def run_online_backup(source: str, target: str, pages_per_step: int, sleep_s: float) -> dict:
+    """Copy a live SQLite database with the online backup API
+
+    The source connection pins a WAL read snapshot for the whole copy, so
+    commits from the storage layer never restart the backup, and in WAL
+    mode a reader never blocks writers. Pages are copied `pages_per_step`
+    at a time with a short sleep between steps to pace the I/O. The WAL
+    cannot be checkpointed past the snapshot until the copy finishes.
+    """
+    stats = {"steps": 0, "max_step_ms": 0.0, "pages": 0}
+    last = {"time": time.perf_counter()}
+
+    def progress(status, remaining, total):
+        stats["max_step_ms"] = max(stats["max_step_ms"], (time.perf_counter() - last["time"]) * 1000)
+        stats["steps"] += 1
+        stats["pages"] = total
+        if remaining and sleep_s > 0:
+            time.sleep(sleep_s)
+        last["time"] = time.perf_counter()
+
+    src = sqlite3.connect(source, isolation_level=None)
+    dst = sqlite3.connect(target)
+    try:
+        src.execute("BEGIN")
+        src.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        try:
+            src.backup(dst, pages=pages_per_step, progress=progress)
+        finally:
+            src.execute("COMMIT")
+    finally:
+        dst.close()
+        src.close()
+    return stats
+
+
+def _retention_count() -> int:
+    from app.core.config import settings
+
+    # A count below 1 would delete the backup that was just written
+    if settings.BACKUP_RETENTION_COUNT < 1:
+        raise ValueError(f"BACKUP_RETENTION_COUNT must be at least 1: {settings.BACKUP_RETENTION_COUNT}")
+    return settings.BACKUP_RETENTION_COUNT
+
+
+class BackupManager:
+    """Scheduled online backups of the storage database (BACKUP_ENABLED)"""
+
+    def __init__(self, storage, backup_path: Optional[str] = None):
+        self.storage = storage
+        self._backup_path = backup_path
+        self.last_report: Optional[BackupReport] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def backup_dir(self) -> Path:
+        from app.core.config import settings
+        return Path(self._backup_path or settings.BACKUP_PATH)
+
+    async def start(self) -> None:
+        """Start the backup schedule if BACKUP_ENABLED"""
+        from app.core.config import settings
+
+        if not settings.BACKUP_ENABLED:
+            logger.info("Backups disabled")
+            return
+        _retention_count()
+        self._task = asyncio.create_task(self._scheduler())
+        logger.info(f"Backups every {settings.BACKUP_INTERVAL_HOURS}h to {self.backup_dir}")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _scheduler(self) -> None:
+        from app.core.config import settings
+
+        while True:
+            try:
+                await self.run_backup()
+            except Exception as e:
+                logger.error(f"Backup failed: {e}")
+            await asyncio.sleep(settings.BACKUP_INTERVAL_HOURS * 3600)
+
+    def list_backups(self) -> List[Path]:
+        """Existing backups, newest first"""
+        return sorted(self.backup_dir.glob(f"{BACKUP_PREFIX}*{BACKUP_SUFFIX}"), reverse=True)
+
+    async def run_backup(self) -> BackupReport:
+        """Take a backup now and apply retention"""
+        from app.core.config import settings
+
+        keep = _retention_count()
+        async with self._lock:
+            self.backup_dir.mkdir(parents=True, exist_ok=True)
+            started_at = datetime.now()
+            target = self.backup_dir / f"{BACKUP_PREFIX}{started_at:%Y%m%d-%H%M%S-%f}{BACKUP_SUFFIX}"
+            partial = target.with_name(target.name + ".partial")
+
+            self.storage.reset_commit_stats()
+            started = time.perf_counter()
+            try:
+                # The copy runs in a thread; the event loop keeps serving writes
+                stats = await asyncio.to_thread(
+                    run_online_backup,
+                    self.storage.path,
+                    str(partial),
+                    settings.BACKUP_PAGES_PER_STEP,
+                    settings.BACKUP_STEP_SLEEP_MS / 1000
+                )
+            except Exception:
+                partial.unlink(missing_ok=True)
+                raise
+            duration_ms = (time.perf_counter() - started) * 1000
+            os.replace(partial, target)
+
+            report = BackupReport(
+                path=str(target),
+                started_at=started_at,
+                duration_ms=round(duration_ms, 1),
+                pages=stats["pages"],
+                steps=stats["steps"],
+                max_step_ms=round(stats["max_step_ms"], 1),
+                max_writer_stall_ms=round(self.storage.reset_commit_stats(), 3),
+                size_bytes=target.stat().st_size
+            )
+            self.last_report = report
+            logger.info(
+                f"Backup written to {target.name} in {report.duration_ms:.0f}ms "
+                f"({report.steps} steps, max step {report.max_step_ms:.1f}ms, "
+                f"max writer stall {report.max_writer_stall_ms:.1f}ms)"
+            )
+
+            for old in self.list_backups()[keep:]:
+                old.unlink(missing_ok=True)
+                logger.info(f"Removed old backup: {old.name}")
+            return report
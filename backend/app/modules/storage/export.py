@@ -0,0 +1,212 @@
+"""
+Bulk Export
+Streams calls from a storage cursor as NDJSON or Parquet
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+CALL_FIELDS = ("id", "started_at", "ended_at", "duration", "transcript", "analysis", "metadata")
+EXPORT_FIELDS = CALL_FIELDS + ("segments", "metrics")
+METRIC_FIELDS = ("talk_ratio", "questions_asked", "average_sentiment", "duration", "keywords")
+JSON_FIELDS = ("analysis", "metadata")
+
+
+@dataclass
+class ExportFilter:
+    """Server-side filters and projection for an export"""
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    rep: Optional[str] = None
+    tag: Optional[str] = None
+    fields: Sequence[str] = EXPORT_FIELDS
+
+    def __post_init__(self):
+        unknown = set(self.fields) - set(EXPORT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown export fields: {', '.join(sorted(unknown))}")
+        if "id" not in self.fields:
+            self.fields = ("id",) + tuple(self.fields)
+
+
+def _build_query(filters: ExportFilter):
+    columns = [f"c.{f}" for f in CALL_FIELDS if f in filters.fields]
+    join = ""
+    if "metrics" in filters.fields:
+        columns += [f"m.{f} AS metric_{f}" for f in METRIC_FIELDS]
+        join = "LEFT JOIN call_metrics m ON m.call_id = c.id"
+
+    where, params = [], []
+    if filters.start is not None:
+        where.append("c.started_at >= ?")
+        params.append(filters.start.isoformat())
+    if filters.end is not None:
+        where.append("c.started_at < ?")
+        params.append(filters.end.isoformat())
+    if filters.rep is not None:
+        where.append("json_extract(c.metadata, '$.rep') = ?")
+        params.append(filters.rep)
+    if filters.tag is not None:
+        where.append("EXISTS (SELECT 1 FROM json_each(c.metadata, '$.tags') WHERE value = ?)")
+        params.append(filters.tag)
+
+    sql = f"SELECT {', '.join(columns)} FROM calls c {join}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return sql + " ORDER BY c.started_at, c.id", params
+
+
+async def iter_calls(storage, filters: ExportFilter, batch_size: int = 200) -> AsyncIterator[List[Dict]]:
+    """Yield batches of exported call records
+
+    Reads through a dedicated read-only connection with fetchmany, so at
+    most one batch (plus its segments) is held in memory at a time.
+    """
+    sql, params = _build_query(filters)
+    db = await storage.connect_readonly()
+    try:
+        async with db.execute(sql, params) as cursor:
+            while rows := await cursor.fetchmany(batch_size):
+                records = []
+                for row in rows:
+                    record = {f: row[f] for f in CALL_FIELDS if f in filters.fields}
+                    if "transcript" in record:
+                        record["transcript"] = storage.decrypt_text(
+                            record["transcript"], "calls.transcript", row["id"]
+                        )
+                    for f in JSON_FIELDS:
+                        if f in record:
+                            record[f] = json.loads(record[f])
+                    if "metrics" in filters.fields:
+                        record["metrics"] = None
+                        if row["metric_talk_ratio"] is not None:
+                            record["metrics"] = {f: row[f"metric_{f}"] for f in METRIC_FIELDS}
+                            record["metrics"]["keywords"] = [
+                                {"word": w, "count": c} for w, c in json.loads(row["metric_keywords"])
+                            ]
+                    records.append(record)
+
+                if "segments" in filters.fields:
+                    await _attach_segments(db, records, storage.decrypt_text)
+                yield records
+    finally:
+        await db.close()
+
+
+async def _attach_segments(db, records: List[Dict], decrypt_text) -> None:
+    by_id = {r["id"]: r for r in records}
+    for record in records:
+        record["segments"] = []
+    placeholders = ",".join("?" * len(by_id))
+    async with db.execute(
+        f"""
+        SELECT call_id, start_time, end_time, text, confidence, speaker
+        FROM transcript_segments WHERE call_id IN ({placeholders})
+        ORDER BY call_id, start_time
+        """,
+        list(by_id)
+    ) as cursor:
+        async for row in cursor:
+            by_id[row["call_id"]]["segments"].append({
+                "start_time": row["start_time"],
+                "end_time": row["end_time"],
+                "text": decrypt_text(row["text"], "transcript_segments.text", row["call_id"]),
+                "confidence": row["confidence"],
+                "speaker": row["speaker"]
+            })
+
+
+async def iter_ndjson(storage, filters: ExportFilter, batch_size: int = 200) -> AsyncIterator[bytes]:
+    """Stream calls as newline-delimited JSON, one chunk per batch"""
+    async for records in iter_calls(storage, filters, batch_size):
+        yield "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records).encode()
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back to the caller"""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def parquet_schema(fields: Sequence[str]):
+    """Arrow schema for the selected export fields"""
+    import pyarrow as pa
+
+    types = {
+        "id": pa.string(),
+        "started_at": pa.string(),
+        "ended_at": pa.string(),
+        "duration": pa.float64(),
+        "transcript": pa.string(),
+        "analysis": pa.string(),
+        "metadata": pa.string(),
+        "segments": pa.list_(pa.struct([
+            ("start_time", pa.float64()),
+            ("end_time", pa.float64()),
+            ("text", pa.string()),
+            ("confidence", pa.float64()),
+            ("speaker", pa.string())
+        ])),
+        "metrics": pa.struct([
+            ("talk_ratio", pa.float64()),
+            ("questions_asked", pa.int64()),
+            ("average_sentiment", pa.float64()),
+            ("duration", pa.float64()),
+            ("keywords", pa.list_(pa.struct([("word", pa.string()), ("count", pa.int64())])))
+        ])
+    }
+    return pa.schema([(f, types[f]) for f in EXPORT_FIELDS if f in fields])
+
+
+async def iter_parquet(storage, filters: ExportFilter, row_group_size: int = 1000) -> AsyncIterator[bytes]:
+    """Stream calls as Parquet, one row group per batch
+
+    The writer targets an in-memory sink that is drained after every row
+    group, so only one row group is buffered. Requires pyarrow.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = parquet_schema(filters.fields)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        async for records in iter_calls(storage, filters, row_group_size):
+            for record in records:
+                for f in JSON_FIELDS:
+                    if f in record:
+                        record[f] = json.dumps(record[f])
+            table = pa.Table.from_pylist(records, schema=schema)
+            await asyncio.to_thread(writer.write_table, table)
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
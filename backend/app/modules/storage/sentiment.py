@@ -0,0 +1,175 @@
+"""
+Sentiment Time Series
+Per-call sentiment points with precomputed multi-width rollups
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+# Rollup bucket widths in seconds, finest first
+ROLLUP_WIDTHS = (5, 30, 120, 600)
+
+
+@dataclass
+class TimelinePoint:
+    """One point of a (possibly downsampled) sentiment timeline"""
+    timestamp: float
+    mean: float
+    min: float
+    max: float
+    count: int
+
+
+@dataclass
+class SeriesVersion:
+    """Cheap fingerprint of a call's series, used for cache validation"""
+    count: int
+    last_bucket: Optional[int]
+
+
+class SentimentSeriesStore:
+    """Stores sentiment points and keeps rollups current on every append
+
+    Points live in a WITHOUT ROWID table clustered by (call_id, t), so a
+    call's series is stored contiguously and range reads are index scans.
+    Each append also upserts (sum, min, max, count) into the bucket of every
+    rollup width, so reads never aggregate raw points.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+
+    async def append(self, call_id: str, points: Iterable[Tuple[float, float]]) -> int:
+        """Append (timestamp, signed score) points to a call's series
+
+        Timestamps already stored for the call (e.g. a retried append) are
+        skipped, so rollups count every point once. Returns the number of
+        points actually inserted.
+        """
+        batch: Dict[float, float] = {}
+        for t, score in points:
+            batch.setdefault(t, score)
+        if not batch:
+            return 0
+
+        async with self.storage.transaction() as db:
+            async with db.execute(
+                "SELECT t FROM sentiment_points WHERE call_id = ? AND t >= ? AND t <= ?",
+                (call_id, min(batch), max(batch))
+            ) as cursor:
+                for row in await cursor.fetchall():
+                    batch.pop(row["t"], None)
+            if not batch:
+                return 0
+
+            buckets: Dict[Tuple[int, int], List[float]] = {}
+            for t, score in batch.items():
+                for width in ROLLUP_WIDTHS:
+                    key = (width, int(t // width))
+                    agg = buckets.get(key)
+                    if agg is None:
+                        buckets[key] = [score, score, score, 1]
+                    else:
+                        agg[0] += score
+                        agg[1] = min(agg[1], score)
+                        agg[2] = max(agg[2], score)
+                        agg[3] += 1
+
+            await db.executemany(
+                "INSERT INTO sentiment_points (call_id, t, score) VALUES (?, ?, ?)",
+                [(call_id, t, score) for t, score in batch.items()]
+            )
+            await db.executemany(
+                """
+                INSERT INTO sentiment_rollups (call_id, width, bucket, total, min, max, count)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(call_id, width, bucket) DO UPDATE SET
+                    total = total + excluded.total,
+                    min = MIN(min, excluded.min),
+                    max = MAX(max, excluded.max),
+                    count = count + excluded.count
+                """,
+                [(call_id, width, bucket, *agg) for (width, bucket), agg in buckets.items()]
+            )
+        return len(batch)
+
+    async def get_version(self, call_id: str) -> SeriesVersion:
+        """Point count and last bucket, read from the coarsest rollup"""
+        async with self.storage.db.execute(
+            "SELECT SUM(count) AS n, MAX(bucket) AS last FROM sentiment_rollups "
+            "WHERE call_id = ? AND width = ?",
+            (call_id, ROLLUP_WIDTHS[-1])
+        ) as cursor:
+            row = await cursor.fetchone()
+        return SeriesVersion(count=row["n"] or 0, last_bucket=row["last"])
+
+    async def get_timeline(self, call_id: str, resolution: int,
+                           start: Optional[float] = None,
+                           end: Optional[float] = None) -> Tuple[Optional[int], List[TimelinePoint]]:
+        """Return at most `resolution` points for [start, end]
+
+        Raw points are returned when few enough fall in the range; otherwise
+        the finest rollup width that fits is used, with adjacent buckets of
+        the coarsest width merged if even that is too dense. Returns the
+        bucket width in seconds (None for raw points) and the points.
+        """
+        db = self.storage.db
+        lo = start if start is not None else -math.inf
+        hi = end if end is not None else math.inf
+
+        # Bounded count: never scans more than resolution + 1 rows
+        async with db.execute(
+            "SELECT COUNT(*) AS n FROM (SELECT 1 FROM sentiment_points "
+            "WHERE call_id = ? AND t >= ? AND t <= ? LIMIT ?)",
+            (call_id, lo, hi, resolution + 1)
+        ) as cursor:
+            n = (await cursor.fetchone())["n"]
+
+        if n <= resolution:
+            async with db.execute(
+                "SELECT t, score FROM sentiment_points WHERE call_id = ? AND t >= ? AND t <= ? ORDER BY t",
+                (call_id, lo, hi)
+            ) as cursor:
+                rows = await cursor.fetchall()
+            return None, [
+                TimelinePoint(timestamp=r["t"], mean=r["score"], min=r["score"], max=r["score"], count=1)
+                for r in rows
+            ]
+
+        if start is None or end is None:
+            version = await self.get_version(call_id)
+            if start is None:
+                lo = 0.0
+            if end is None:
+                hi = ((version.last_bucket or 0) + 1) * ROLLUP_WIDTHS[-1]
+        span = max(hi - lo, 0.0)
+
+        width = ROLLUP_WIDTHS[-1]
+        for candidate in ROLLUP_WIDTHS:
+            if math.ceil(span / candidate) <= resolution:
+                width = candidate
+                break
+
+        async with db.execute(
+            "SELECT bucket, total, min, max, count FROM sentiment_rollups "
+            "WHERE call_id = ? AND width = ? AND bucket >= ? AND bucket <= ? ORDER BY bucket",
+            (call_id, width, int(lo // width), int(hi // width))
+        ) as cursor:
+            rows = await cursor.fetchall()
+
+        merge = max(1, math.ceil(len(rows) / resolution))
+        points = []
+        for i in range(0, len(rows), merge):
+            group = rows[i:i + merge]
+            count = sum(r["count"] for r in group)
+            points.append(TimelinePoint(
+                timestamp=group[0]["bucket"] * width,
+                mean=sum(r["total"] for r in group) / count,
+                min=min(r["min"] for r in group),
+                max=max(r["max"] for r in group),
+                count=count
+            ))
+        return width * merge, points
@@ -0,0 +1,128 @@
+"""
+Waveform Peaks
+Multi-resolution min/max peak pyramid for scrubbing long recordings
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional
+import logging
+
+import numpy as np
+
+from app.core.crypto import open_for_read
+
+logger = logging.getLogger(__name__)
+
+BASE_SAMPLES_PER_PEAK = 64  # 4ms at 16kHz
+MIN_LEVEL_PEAKS = 256       # stop adding levels once a level is this small
+_READ_BLOCK = BASE_SAMPLES_PER_PEAK * 16384
+
+
+@dataclass
+class WaveformPeaks:
+    """Peaks for a requested time range"""
+    start: float
+    end: float
+    samples_per_peak: int
+    min: List[int]
+    max: List[int]
+
+
+def _level_path(directory: Path, samples_per_peak: int) -> Path:
+    return directory / f"peaks_{samples_per_peak}.i16"
+
+
+def build_peak_pyramid(segments: Iterable[Path], directory: Path,
+                       key: Optional[bytes] = None) -> List[int]:
+    """Compute the peak pyramid from raw pcm16 segments
+
+    Level 0 holds one (min, max) pair per BASE_SAMPLES_PER_PEAK samples and
+    every further level halves the resolution. Each level is written to its
+    own file so reads can memory-map just the level they need. Returns the
+    samples-per-peak of each level written (empty when there are no samples).
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    base_path = _level_path(directory, BASE_SAMPLES_PER_PEAK)
+    carry = b""
+    with open(base_path, "wb") as out:
+        for segment in segments:
+            with open_for_read(segment, key, recover=True) as f:
+                while block := f.read(_READ_BLOCK * 2):
+                    block = carry + block
+                    usable = len(block) - len(block) % (BASE_SAMPLES_PER_PEAK * 2)
+                    carry = block[usable:]
+                    if usable:
+                        samples = np.frombuffer(block[:usable], dtype="<i2")
+                        _write_peaks(out, samples.reshape(-1, BASE_SAMPLES_PER_PEAK))
+        if carry:
+            samples = np.frombuffer(carry[:len(carry) - len(carry) % 2], dtype="<i2")
+            if samples.size:
+                _write_peaks(out, samples.reshape(1, -1))
+
+    if base_path.stat().st_size == 0:
+        # No audio was recorded; write no levels at all
+        base_path.unlink()
+        return []
+
+    levels = [BASE_SAMPLES_PER_PEAK]
+    previous = np.memmap(base_path, dtype="<i2", mode="r").reshape(-1, 2)
+    while previous.shape[0] > MIN_LEVEL_PEAKS:
+        samples_per_peak = levels[-1] * 2
+        with open(_level_path(directory, samples_per_peak), "wb") as out:
+            # Reduce in blocks so memory stays bounded for multi-hour calls
+            for i in range(0, previous.shape[0], _READ_BLOCK):
+                block = np.asarray(previous[i:i + _READ_BLOCK])
+                if block.shape[0] % 2:
+                    block = np.concatenate([block, block[-1:]])
+                pairs = block.reshape(-1, 2, 2)
+                reduced = np.stack([pairs[:, :, 0].min(axis=1), pairs[:, :, 1].max(axis=1)], axis=1)
+                out.write(reduced.astype("<i2").tobytes())
+        levels.append(samples_per_peak)
+        previous = np.memmap(_level_path(directory, samples_per_peak), dtype="<i2", mode="r").reshape(-1, 2)
+    return levels
+
+
+def _write_peaks(out, frames: np.ndarray) -> None:
+    peaks = np.stack([frames.min(axis=1), frames.max(axis=1)], axis=1)
+    out.write(peaks.astype("<i2").tobytes())
+
+
+def read_peaks(directory: Path, start: float, end: float, px: int,
+               sample_rate: int = 16000) -> Optional[WaveformPeaks]:
+    """Return at most px peaks for [start, end)
+
+    Picks the coarsest level that still has at least px peaks in the range,
+    which holds fewer than 2 * px peaks, so the work done is bounded by px
+    regardless of the recording length.
+    """
+    levels = sorted(
+        int(p.stem.split("_")[1]) for p in directory.glob("peaks_*.i16") if p.stat().st_size
+    )
+    if not levels or end <= start or px <= 0:
+        return None
+
+    wanted = (end - start) * sample_rate / px
+    samples_per_peak = levels[0]
+    for level in levels:
+        if level <= wanted:
+            samples_per_peak = level
+
+    peaks = np.memmap(_level_path(directory, samples_per_peak), dtype="<i2", mode="r").reshape(-1, 2)
+    first = min(int(start * sample_rate) // samples_per_peak, peaks.shape[0])
+    last = min(-(-int(end * sample_rate) // samples_per_peak), peaks.shape[0])
+    window = np.asarray(peaks[first:last])
+
+    if window.shape[0] > px:
+        edges = np.linspace(0, window.shape[0], px + 1).astype(np.int64)[:-1]
+        mins = np.minimum.reduceat(window[:, 0], edges)
+        maxs = np.maximum.reduceat(window[:, 1], edges)
+    else:
+        mins, maxs = window[:, 0], window[:, 1]
+
+    return WaveformPeaks(
+        start=first * samples_per_peak / sample_rate,
+        end=last * samples_per_peak / sample_rate,
+        samples_per_peak=samples_per_peak,
+        min=mins.tolist(),
+        max=maxs.tolist()
+    )
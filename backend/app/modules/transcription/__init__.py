@@ -50,30 +50,53 @@ class TranscriptionInterface(ABC):
 
 
 class TranscriptionEngine(TranscriptionInterface):
-    """Implementation using faster-whisper or similar"""
+    """Implementation using faster-whisper or similar
+    
+    The model is loaded on first inference unless PRELOAD_MODELS is set, so
+    model imports stay out of startup. With ML_BACKEND="stub" the load step
+    is skipped entirely.
+    """
     
     def __init__(self):
         self.model = None
         self.model_loaded = False
+        self._load_lock = asyncio.Lock()
         logger.info("TranscriptionEngine initialized")
     
     async def initialize(self) -> None:
-        """Load the transcription model"""
-        try:
-            # TODO: Load actual model (faster-whisper, Vosk, etc.)
-            logger.info("Loading transcription model...")
-            await asyncio.sleep(1)  # Simulate model loading
-            self.model_loaded = True
-            logger.info("Transcription model loaded successfully")
-        except Exception as e:
-            logger.error(f"Failed to load transcription model: {e}")
-            raise
+        """Prepare the engine, loading the model now only if PRELOAD_MODELS"""
+        from app.core.config import settings
+        
+        if settings.PRELOAD_MODELS:
+            await self.load_model()
+        else:
+            logger.info("Transcription model will be loaded on first use")
+    
+    async def load_model(self) -> None:
+        """Load the transcription model once"""
+        if self.model_loaded:
+            return
+        async with self._load_lock:
+            if self.model_loaded:
+                return
+            from app.core.config import settings
+            from app.core.profiling import startup_profiler
+            
+            try:
+                logger.info(f"Loading transcription model ({settings.ML_BACKEND})...")
+                with startup_profiler.phase("model_load:transcription"):
+                    if settings.ML_BACKEND != "stub":
+                        # TODO: Load actual model (faster-whisper, Vosk, etc.)
+                        await asyncio.sleep(1)  # Simulate model loading
+                self.model_loaded = True
+                logger.info("Transcription model loaded successfully")
+            except Exception as e:
+                logger.error(f"Failed to load transcription model: {e}")
+                raise
     
     async def transcribe_chunk(self, audio_data: bytes) -> Optional[TranscriptSegment]:
         """Transcribe a single audio chunk"""
-        if not self.model_loaded:
-            logger.warning("Model not loaded, cannot transcribe")
-            return None
+        await self.load_model()
         
         # TODO: Implement actual transcription
         # This is a placeholder
@@ -86,9 +109,7 @@ class TranscriptionEngine(TranscriptionInterface):
     
     async def transcribe_stream(self, audio_stream) -> AsyncIterator[TranscriptSegment]:
         """Transcribe an audio stream"""
-        if not self.model_loaded:
-            logger.warning("Model not loaded, cannot transcribe")
-            return
+        await self.load_model()
         
         # TODO: Implement streaming transcription
         buffer = []
@@ -0,0 +1,103 @@
+"""
+Benchmark encrypted vs plaintext audio storage I/O
+
+Times the code paths calls actually use: live recording through
+SegmentWriter, and range playback through RangeFileResponse (the
+streaming path used when the server has no zero-copy extension).
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.api.responses import RangeFileResponse  # noqa: E402
+from app.core.crypto import generate_key, load_storage_key  # noqa: E402
+from app.modules.storage.audio import SegmentWriter  # noqa: E402
+
+CHUNK = 3200  # 100ms of 16kHz mono pcm16, as written by live calls
+SEGMENT_BYTES = 60 * 16000 * 2
+
+
+def bench_write(directory, data, key):
+    started = time.perf_counter()
+    writer = SegmentWriter(directory, SEGMENT_BYTES, key)
+    for i in range(0, len(data), CHUNK):
+        writer.write(data[i:i + CHUNK])
+    segments = writer.close()
+    return time.perf_counter() - started, segments
+
+
+async def _serve(path, key, offset, length):
+    received = 0
+
+    async def send(message):
+        nonlocal received
+        received += len(message.get("body", b""))
+
+    response = RangeFileResponse(str(path), f"bytes={offset}-{offset + length - 1}",
+                                 "audio/wav", key=key)
+    await response(
+        {"type": "http", "method": "GET", "extensions": {}}, None, send
+    )
+    return received
+
+
+def bench_read(path, size, key, reads, read_size):
+    offsets = [random.randrange(0, size - read_size) for _ in range(reads)]
+
+    async def run():
+        for offset in offsets:
+            assert await _serve(path, key, offset, read_size) == read_size
+
+    started = time.perf_counter()
+    asyncio.run(run())
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure encryption-at-rest overhead")
+    parser.add_argument("--size-mb", type=int, default=64, help="Audio size to write")
+    parser.add_argument("--reads", type=int, default=2000, help="Random range requests")
+    parser.add_argument("--read-size", type=int, default=64 * 1024, help="Bytes per range request")
+    parser.add_argument("--max-overhead", type=float, default=25.0,
+                        help="Fail if write or read overhead exceeds this percentage")
+    args = parser.parse_args()
+
+    key = load_storage_key(generate_key())
+    data = os.urandom(args.size_mb * 1024 * 1024)
+    with tempfile.TemporaryDirectory() as tmp:
+        plain_s, plain_segments = bench_write(Path(tmp) / "plain", data, None)
+        sealed_s, sealed_segments = bench_write(Path(tmp) / "sealed", data, key)
+        size = min(len(data), SEGMENT_BYTES)
+        results = {
+            "write": (plain_s, sealed_s),
+            "read": (
+                bench_read(plain_segments[0], size, None, args.reads, args.read_size),
+                bench_read(sealed_segments[0], size, key, args.reads, args.read_size)
+            )
+        }
+
+    failed = False
+    print(f"{'op':<6} {'plain MB/s':>12} {'encrypted MB/s':>15} {'overhead':>10}")
+    for op, (plain_s, sealed_s) in results.items():
+        mb = args.size_mb if op == "write" else args.reads * args.read_size / 2 ** 20
+        overhead = (sealed_s / plain_s - 1) * 100
+        print(f"{op:<6} {mb / plain_s:>12.1f} {mb / sealed_s:>15.1f} {overhead:>9.1f}%")
+        if overhead > args.max_overhead:
+            failed = True
+
+    if failed:
+        print(f"✗ Overhead above {args.max_overhead}%")
+        return False
+    print(f"✓ Overhead within {args.max_overhead}%")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,60 @@
+"""
+Script to export calls as NDJSON or Parquet
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.modules.storage import storage  # noqa: E402
+from app.modules.storage.export import ExportFilter, EXPORT_FIELDS, iter_ndjson, iter_parquet  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Export calls from the nAnalyzer database")
+    parser.add_argument("--format", choices=["ndjson", "parquet"], default="ndjson")
+    parser.add_argument("--start", type=datetime.fromisoformat, help="Earliest call start (ISO 8601)")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="Latest call start, exclusive (ISO 8601)")
+    parser.add_argument("--rep", help="Only calls for this rep")
+    parser.add_argument("--tag", help="Only calls with this metadata tag")
+    parser.add_argument("--fields", default=",".join(EXPORT_FIELDS), help="Comma-separated fields to export")
+    parser.add_argument("--output", "-o", help="Output file (default: stdout)")
+    return parser.parse_args()
+
+
+async def export_calls(args) -> int:
+    """Stream the export to the output file, returning the bytes written"""
+    filters = ExportFilter(
+        start=args.start,
+        end=args.end,
+        rep=args.rep,
+        tag=args.tag,
+        fields=tuple(f.strip() for f in args.fields.split(","))
+    )
+    chunks = iter_parquet(storage, filters) if args.format == "parquet" else iter_ndjson(storage, filters)
+
+    await storage.initialize()
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    written = 0
+    try:
+        async for chunk in chunks:
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if args.output:
+            out.close()
+        await storage.close()
+    return written
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        written = asyncio.run(export_calls(args))
+    except ValueError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"✓ Exported {written} bytes", file=sys.stderr)
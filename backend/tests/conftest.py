@@ -0,0 +1,20 @@
+"""
+Shared test fixtures
+"""
+import os
+
+# Run against stub engines so no ML library (torch, transformers,
+# faster-whisper) is ever imported by the test suite
+os.environ.setdefault("ML_BACKEND", "stub")
+
+import pytest_asyncio  # noqa: E402
+from app.modules.storage import StorageModule  # noqa: E402
+
+
+@pytest_asyncio.fixture
+async def storage(tmp_path):
+    """Storage module backed by a temporary SQLite database"""
+    module = StorageModule(f"sqlite:///{tmp_path / 'test.db'}")
+    await module.initialize()
+    yield module
+    await module.close()
@@ -0,0 +1,145 @@
+"""
+Tests for cross-call analytics rollups
+"""
+import sqlite3
+import pytest
+from datetime import date, datetime
+from app.modules.analysis import CallMetrics, Keyword
+from app.modules.storage import CallData
+from app.modules.storage.analytics import AnalyticsRollupStore
+
+
+def _metrics(talk_ratio, questions, sentiment):
+    return CallMetrics(
+        talk_ratio=talk_ratio,
+        listen_ratio=1 - talk_ratio,
+        questions_asked=questions,
+        average_sentiment=sentiment,
+        duration=600.0
+    )
+
+
+@pytest.mark.asyncio
+async def test_rollups_by_rep(storage):
+    """Test calls are aggregated per rep and day"""
+    rollups = AnalyticsRollupStore(storage)
+    started = datetime(2025, 1, 8, 10, 0)  # a Wednesday
+    await rollups.finalize_call("c1", started, {"rep": "alice", "tags": ["demo"]},
+                                _metrics(0.6, 4, 0.5), [Keyword("pricing", 0.9, 3)])
+    await rollups.finalize_call("c2", started, {"rep": "alice"},
+                                _metrics(0.4, 2, 0.1), [Keyword("pricing", 0.8, 1), Keyword("demo", 0.5, 2)])
+    await rollups.finalize_call("c3", started, {"rep": "bob"}, _metrics(0.5, 1, 0.0), [])
+
+    buckets = await rollups.query("day", "rep", date(2025, 1, 1), date(2025, 1, 31))
+    alice = next(b for b in buckets if b.value == "alice")
+    assert alice.calls == 2
+    assert alice.avg_talk_ratio == pytest.approx(0.5)
+    assert alice.avg_questions == pytest.approx(3)
+    assert alice.top_keywords[0] == ("pricing", 4)
+
+    weekly = await rollups.query("week", "all", date(2025, 1, 1), date(2025, 1, 31))
+    assert len(weekly) == 1
+    assert weekly[0].bucket_start == date(2025, 1, 6)
+    assert weekly[0].calls == 3
+
+
+@pytest.mark.asyncio
+async def test_refinalize_and_delete(storage):
+    """Test re-finalizing replaces and deleting removes a call's contribution"""
+    rollups = AnalyticsRollupStore(storage)
+    started = datetime(2025, 1, 8, 10, 0)
+    await storage.save_call(CallData("c1", started, None, None, "", {}, {"rep": "alice"}))
+    await rollups.finalize_call("c1", started, {"rep": "alice"}, _metrics(0.6, 4, 0.5), [])
+    await rollups.finalize_call("c1", started, {"rep": "alice"}, _metrics(0.2, 2, 0.5), [])
+
+    buckets = await rollups.query("day", "rep", date(2025, 1, 8), date(2025, 1, 8), value="alice")
+    assert buckets[0].calls == 1
+    assert buckets[0].avg_talk_ratio == pytest.approx(0.2)
+
+    await storage.delete_call("c1")
+    assert await rollups.query("day", "rep", date(2025, 1, 8), date(2025, 1, 8)) == []
+
+
+@pytest.mark.asyncio
+async def test_repeated_tags_counted_once(storage):
+    """Test a call listing a tag twice counts once in that tag's bucket"""
+    rollups = AnalyticsRollupStore(storage)
+    started = datetime(2025, 1, 8, 10, 0)
+    await rollups.finalize_call("c1", started, {"tags": ["demo", "demo"]},
+                                _metrics(0.6, 4, 0.5), [])
+
+    buckets = await rollups.query("day", "tag", date(2025, 1, 8), date(2025, 1, 8), value="demo")
+    assert buckets[0].calls == 1
+    assert buckets[0].avg_talk_ratio == pytest.approx(0.6)
+    assert buckets[0].total_duration == pytest.approx(600.0)
+
+
+@pytest.mark.asyncio
+async def test_failed_refinalize_keeps_previous_contribution(storage):
+    """Test an error after the old contribution is subtracted undoes the subtraction"""
+    rollups = AnalyticsRollupStore(storage)
+    started = datetime(2025, 1, 8, 10, 0)
+    await rollups.finalize_call("c1", started, {"rep": "alice"}, _metrics(0.6, 4, 0.5), [])
+    with pytest.raises(sqlite3.IntegrityError):
+        await rollups.finalize_call("c1", started, {"rep": "alice"}, CallMetrics(
+            talk_ratio=None, listen_ratio=0.4, questions_asked=4, average_sentiment=0.5, duration=600.0
+        ), [])
+
+    buckets = await rollups.query("day", "rep", date(2025, 1, 8), date(2025, 1, 8), value="alice")
+    assert buckets[0].calls == 1
+    assert buckets[0].avg_talk_ratio == pytest.approx(0.6)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_finalize(storage):
+    """Test finalizes interleaved with other commits on the shared connection"""
+    import asyncio
+    rollups = AnalyticsRollupStore(storage)
+    started = datetime(2025, 1, 8, 10, 0)
+
+    async def finalize():
+        for i in range(100):
+            await rollups.finalize_call(f"c{i}", started, {"rep": "alice"}, _metrics(0.5, 1, 0.0), [])
+
+    async def calls():
+        for i in range(100):
+            await storage.save_call(CallData(f"other{i}", started, None, None, "", {}, {}))
+
+    await asyncio.gather(finalize(), calls())
+
+    buckets = await rollups.query("day", "rep", date(2025, 1, 8), date(2025, 1, 8), value="alice")
+    assert buckets[0].calls == 100
+
+
+@pytest.mark.asyncio
+async def test_top_keywords_per_bucket(storage):
+    """Test keywords are ranked and trimmed separately for each bucket"""
+    rollups = AnalyticsRollupStore(storage)
+    started = datetime(2025, 1, 8, 10, 0)
+    await rollups.finalize_call("c1", started, {"rep": "alice"}, _metrics(0.5, 1, 0.0),
+                                [Keyword("pricing", 0.9, 3), Keyword("demo", 0.5, 1)])
+    await rollups.finalize_call("c2", started, {"rep": "bob"}, _metrics(0.5, 1, 0.0),
+                                [Keyword("renewal", 0.9, 1), Keyword("budget", 0.5, 5)])
+
+    buckets = await rollups.query("day", "rep", date(2025, 1, 8), date(2025, 1, 8), top_keywords=1)
+    assert {b.value: b.top_keywords for b in buckets} == {
+        "alice": [("pricing", 3)],
+        "bob": [("budget", 5)]
+    }
+
+
+@pytest.mark.asyncio
+async def test_removed_call_leaves_no_empty_rows(storage):
+    """Test removing the only call in a bucket deletes its rollup and keyword rows"""
+    rollups = AnalyticsRollupStore(storage)
+    started = datetime(2025, 1, 8, 10, 0)
+    await rollups.finalize_call("c1", started, {"rep": "alice"}, _metrics(0.5, 1, 0.0),
+                                [Keyword("pricing", 0.9, 3)])
+    await rollups.finalize_call("c2", started, {"rep": "bob"}, _metrics(0.5, 1, 0.0),
+                                [Keyword("pricing", 0.9, 2)])
+    assert await rollups.remove_call("c1") is True
+
+    async with storage.db.execute("SELECT DISTINCT value FROM analytics_keywords") as cursor:
+        assert {r["value"] for r in await cursor.fetchall()} == {"*", "bob"}
+    async with storage.db.execute("SELECT DISTINCT value FROM analytics_rollups") as cursor:
+        assert {r["value"] for r in await cursor.fetchall()} == {"*", "bob"}
@@ -49,3 +49,90 @@ async def test_audio_stream_generation():
             break
     
     assert chunk_count >= 3
+
+
+def _write_wav(path, seconds, sample_rate=16000):
+    """Write a 16-bit mono WAV file with a ramp signal"""
+    import wave
+    samples = bytes(i % 256 for i in range(int(seconds * sample_rate) * 2))
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(samples)
+    return samples
+
+
+@pytest.mark.asyncio
+async def test_file_replay_zero_copy(tmp_path):
+    """Test file sources yield memory-mapped chunks of the whole file"""
+    path = tmp_path / "call.wav"
+    samples = _write_wav(path, 1.05)
+    module = AudioCaptureModule()
+    source = AudioSource(type="file", file_path=str(path), pacing="max")
+
+    stream_id = await module.start_capture(source)
+    chunks = [chunk async for chunk in module.get_audio_stream(stream_id)]
+
+    assert len(chunks) == 11
+    assert all(isinstance(chunk.data, memoryview) for chunk in chunks)
+    assert b"".join(chunk.data for chunk in chunks) == samples
+    assert chunks[1].timestamp - chunks[0].timestamp == pytest.approx(0.1)
+    assert module.active_streams[stream_id] is False
+    assert stream_id not in module.sources
+
+
+@pytest.mark.asyncio
+async def test_file_replay_accelerated_pacing(tmp_path):
+    """Test accelerated pacing replays faster than real time"""
+    import time
+    path = tmp_path / "call.wav"
+    _write_wav(path, 1.0)
+    module = AudioCaptureModule()
+    source = AudioSource(type="file", file_path=str(path), pacing="accelerated", speed=10.0)
+
+    stream_id = await module.start_capture(source)
+    started = time.monotonic()
+    count = 0
+    async for _ in module.get_audio_stream(stream_id):
+        count += 1
+    elapsed = time.monotonic() - started
+
+    assert count == 10
+    assert 0.09 <= elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_file_source_validation():
+    """Test invalid file sources are rejected"""
+    module = AudioCaptureModule()
+    with pytest.raises(ValueError):
+        await module.start_capture(AudioSource(type="file"))
+    with pytest.raises(ValueError):
+        await module.start_capture(AudioSource(type="file", file_path="x.wav", pacing="warp"))
+
+
+@pytest.mark.asyncio
+async def test_file_source_must_exist(tmp_path):
+    """Test missing and empty files are rejected before a stream starts"""
+    module = AudioCaptureModule()
+    with pytest.raises(ValueError):
+        await module.start_capture(AudioSource(type="file", file_path=str(tmp_path / "missing.wav")))
+    (tmp_path / "empty.pcm").write_bytes(b"")
+    with pytest.raises(ValueError):
+        await module.start_capture(AudioSource(type="file", file_path=str(tmp_path / "empty.pcm")))
+    assert module.active_streams == {}
+    assert module.sources == {}
+
+
+@pytest.mark.asyncio
+async def test_file_source_truncated_header(tmp_path):
+    """Test a WAV file cut off inside its fmt chunk is rejected as invalid"""
+    import struct
+
+    path = tmp_path / "truncated.wav"
+    path.write_bytes(b"RIFF" + struct.pack("<I", 24) + b"WAVE" + b"fmt " + struct.pack("<I", 16) + b"\x01\x00")
+    module = AudioCaptureModule()
+    with pytest.raises(ValueError, match="Truncated"):
+        await module.start_capture(AudioSource(type="file", file_path=str(path)))
+    assert module.active_streams == {}
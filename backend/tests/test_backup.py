@@ -0,0 +1,129 @@
+"""
+Tests for online database backups
+"""
+import asyncio
+import sqlite3
+import pytest
+from datetime import datetime
+from app.core.config import settings
+from app.modules.analysis import CallMetrics
+from app.modules.storage import CallData, TranscriptSegment
+from app.modules.storage.analytics import AnalyticsRollupStore
+from app.modules.storage.backup import BackupManager
+from app.modules.storage.sentiment import SentimentSeriesStore
+
+
+async def _save_call(storage, call_id):
+    await storage.save_call(CallData(
+        id=call_id,
+        started_at=datetime(2025, 1, 8, 10, 0),
+        ended_at=datetime(2025, 1, 8, 10, 1),
+        duration=60.0,
+        transcript="hello " * 200,
+        analysis={},
+        metadata={"rep": "alice"}
+    ))
+    await storage.save_segments(call_id, [
+        TranscriptSegment(speaker="rep", text=f"segment {i} " * 20, start_time=i, end_time=i + 1, confidence=0.9)
+        for i in range(20)
+    ])
+
+
+@pytest.mark.asyncio
+async def test_backup_during_writes(storage, tmp_path, monkeypatch):
+    """Test a backup taken while calls are written is a consistent copy"""
+    monkeypatch.setattr(settings, "BACKUP_PAGES_PER_STEP", 4)
+    monkeypatch.setattr(settings, "BACKUP_STEP_SLEEP_MS", 1)
+    for i in range(20):
+        await _save_call(storage, f"before-{i}")
+
+    manager = BackupManager(storage, str(tmp_path / "backups"))
+    backup = asyncio.create_task(manager.run_backup())
+    commits = 0
+    while not backup.done():
+        await _save_call(storage, f"during-{commits}")
+        commits += 2
+    report = await backup
+
+    assert commits > 0
+    assert report.steps > 1
+    assert report.pages > 0
+    assert report.duration_ms > 0
+    assert report.size_bytes > 0
+    # Commits ran while the copy was in progress, and none waited long
+    assert 0 < report.max_writer_stall_ms < 250
+
+    db = sqlite3.connect(report.path)
+    try:
+        assert db.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        calls = {r[0] for r in db.execute("SELECT id FROM calls")}
+    finally:
+        db.close()
+    assert {f"before-{i}" for i in range(20)} <= calls
+    assert manager.last_report is report
+
+
+@pytest.mark.asyncio
+async def test_writer_stall_covers_all_writers(storage, tmp_path, monkeypatch):
+    """Test sentiment and analytics commits count toward the writer stall"""
+    monkeypatch.setattr(settings, "BACKUP_PAGES_PER_STEP", 1)
+    monkeypatch.setattr(settings, "BACKUP_STEP_SLEEP_MS", 1)
+    for i in range(5):
+        await _save_call(storage, f"before-{i}")
+    series = SentimentSeriesStore(storage)
+    rollups = AnalyticsRollupStore(storage)
+    metrics = CallMetrics(talk_ratio=0.5, listen_ratio=0.5, questions_asked=1,
+                          average_sentiment=0.2, duration=60.0)
+
+    # Make every commit slow so the stall can only come from these writers
+    commit = storage.db.commit
+
+    async def slow_commit():
+        await asyncio.sleep(0.02)
+        await commit()
+
+    monkeypatch.setattr(storage.db, "commit", slow_commit)
+    manager = BackupManager(storage, str(tmp_path / "backups"))
+    backup = asyncio.create_task(manager.run_backup())
+    writes = 0
+    while not backup.done():
+        await series.append("call_1", [(float(writes), 0.5)])
+        await rollups.finalize_call(f"c{writes}", datetime(2025, 1, 8, 10, 0), {"rep": "alice"}, metrics, [])
+        writes += 1
+    report = await backup
+
+    assert writes > 0
+    assert report.max_writer_stall_ms >= 20
+
+
+@pytest.mark.asyncio
+async def test_backup_rotation(storage, tmp_path, monkeypatch):
+    """Test only the newest BACKUP_RETENTION_COUNT backups are kept"""
+    monkeypatch.setattr(settings, "BACKUP_RETENTION_COUNT", 2)
+    await _save_call(storage, "c1")
+    manager = BackupManager(storage, str(tmp_path / "backups"))
+
+    paths = [(await manager.run_backup()).path for _ in range(4)]
+
+    kept = [str(p) for p in manager.list_backups()]
+    assert kept == paths[:-3:-1]
+
+
+@pytest.mark.asyncio
+async def test_backup_retention_must_keep_one(storage, tmp_path, monkeypatch):
+    """Test a retention count below 1 is rejected before anything is written"""
+    monkeypatch.setattr(settings, "BACKUP_RETENTION_COUNT", 0)
+    manager = BackupManager(storage, str(tmp_path / "backups"))
+    with pytest.raises(ValueError):
+        await manager.run_backup()
+    assert not (tmp_path / "backups").exists()
+
+
+@pytest.mark.asyncio
+async def test_backup_disabled(storage, tmp_path, monkeypatch):
+    """Test no schedule is started unless BACKUP_ENABLED"""
+    monkeypatch.setattr(settings, "BACKUP_ENABLED", False)
+    manager = BackupManager(storage, str(tmp_path / "backups"))
+    await manager.start()
+    assert manager._task is None
+    await manager.stop()
@@ -0,0 +1,130 @@
+"""
+Tests for chunked encryption at rest
+"""
+import os
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.api.responses import RangeFileResponse
+from app.core.crypto import (
+    DecryptionError, EncryptedReader, EncryptedWriter, HEADER_SIZE,
+    decrypt_field, encrypt_field, generate_key, load_storage_key
+)
+
+KEY = load_storage_key(generate_key())
+
+
+def _encrypt(path, data, block_size=1024, write_size=300):
+    with EncryptedWriter(path, KEY, block_size=block_size) as out:
+        for i in range(0, len(data), write_size):
+            out.write(data[i:i + write_size])
+
+
+@pytest.mark.parametrize("size", [0, 1, 1023, 1024, 1025, 4096, 10000])
+def test_round_trip(tmp_path, size):
+    """Test streaming writes decrypt back for block-boundary sizes"""
+    data = os.urandom(size)
+    _encrypt(tmp_path / "a.enc", data)
+
+    with EncryptedReader(tmp_path / "a.enc", KEY) as reader:
+        assert reader.size == size
+        assert reader.read() == data
+
+
+def test_random_access(tmp_path):
+    """Test ranges decrypt only the blocks they overlap"""
+    data = os.urandom(10000)
+    _encrypt(tmp_path / "a.enc", data)
+
+    with EncryptedReader(tmp_path / "a.enc", KEY) as reader:
+        assert reader.read_range(1000, 50) == data[1000:1050]
+        assert reader.read_range(9990, 100) == data[9990:]
+        reader.seek(5000)
+        assert reader.read(10) == data[5000:5010]
+
+
+def test_tampering_detected(tmp_path):
+    """Test modified and truncated containers fail authentication"""
+    _encrypt(tmp_path / "a.enc", os.urandom(5000))
+    raw = bytearray((tmp_path / "a.enc").read_bytes())
+
+    tampered = bytearray(raw)
+    tampered[HEADER_SIZE + 10] ^= 1
+    (tmp_path / "b.enc").write_bytes(tampered)
+    with EncryptedReader(tmp_path / "b.enc", KEY) as reader:
+        with pytest.raises(DecryptionError):
+            reader.read_range(0, 10)
+
+    # Dropping the final block leaves a non-final block at the end
+    (tmp_path / "c.enc").write_bytes(raw[:HEADER_SIZE + 4 * (1024 + 16)])
+    with EncryptedReader(tmp_path / "c.enc", KEY) as reader:
+        with pytest.raises(DecryptionError):
+            reader.read()
+
+
+def test_recover_unclosed_container(tmp_path):
+    """Test recover mode keeps sealed blocks and drops a torn tail"""
+    data = os.urandom(5000)
+    path = tmp_path / "a.enc"
+    writer = EncryptedWriter(path, KEY, block_size=1024)
+    writer.write(data)
+    writer._file.close()  # never closed: no final block
+    raw = path.read_bytes()
+    path.write_bytes(raw + raw[HEADER_SIZE:HEADER_SIZE + 100])  # torn partial block
+
+    with EncryptedReader(path, KEY) as reader:
+        with pytest.raises(DecryptionError):
+            reader.read()
+    with EncryptedReader(path, KEY, recover=True) as reader:
+        assert not reader.complete
+        assert reader.read() == data[:4096]
+
+
+def test_field_encryption():
+    """Test text fields round trip and plaintext passes through"""
+    sealed = encrypt_field("call me at 555-0100", KEY, "calls.transcript:c1")
+    assert "555" not in sealed
+    assert decrypt_field(sealed, KEY, "calls.transcript:c1") == "call me at 555-0100"
+    assert decrypt_field("plain", KEY, "calls.transcript:c1") == "plain"
+    assert encrypt_field("plain", None, "calls.transcript:c1") == "plain"
+
+
+def test_field_bound_to_context():
+    """Test a sealed value moved to another call or column is rejected"""
+    sealed = encrypt_field("call me at 555-0100", KEY, "calls.transcript:c1")
+    with pytest.raises(DecryptionError):
+        decrypt_field(sealed, KEY, "calls.transcript:c2")
+    with pytest.raises(DecryptionError):
+        decrypt_field(sealed, KEY, "transcript_segments.text:c1")
+
+
+def test_legacy_field_readable():
+    """Test values written before context binding still decrypt"""
+    import base64
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    from app.core.crypto import LEGACY_FIELD_PREFIX
+
+    nonce = os.urandom(12)
+    sealed = AESGCM(KEY).encrypt(nonce, b"hello", LEGACY_FIELD_PREFIX.encode())
+    legacy = LEGACY_FIELD_PREFIX + base64.b64encode(nonce + sealed).decode()
+    assert decrypt_field(legacy, KEY, "calls.transcript:c1") == "hello"
+
+
+def test_encrypted_range_response(tmp_path):
+    """Test range playback of an encrypted file"""
+    data = os.urandom(200000)
+    path = tmp_path / "audio.wav.enc"
+    _encrypt(path, data, block_size=65536, write_size=4096)
+
+    app = FastAPI()
+
+    @app.get("/audio")
+    async def audio(request: Request):
+        return RangeFileResponse(str(path), request.headers.get("range"), "audio/wav", key=KEY)
+
+    client = TestClient(app)
+    assert client.get("/audio").content == data
+    partial = client.get("/audio", headers={"Range": "bytes=65530-65545"})
+    assert partial.status_code == 206
+    assert partial.headers["content-range"] == "bytes 65530-65545/200000"
+    assert partial.content == data[65530:65546]
@@ -0,0 +1,79 @@
+"""
+Tests for bulk call export
+"""
+import io
+import json
+import pytest
+from datetime import datetime
+from app.modules.analysis import CallMetrics, Keyword
+from app.modules.storage import CallData
+from app.modules.storage.analytics import AnalyticsRollupStore
+from app.modules.storage.export import ExportFilter, iter_ndjson, iter_parquet
+from app.modules.transcription import TranscriptSegment
+
+
+async def _seed(storage):
+    for i in range(5):
+        call = CallData(
+            id=f"call_{i}",
+            started_at=datetime(2025, 1, 1 + i, 9),
+            ended_at=datetime(2025, 1, 1 + i, 10),
+            duration=3600.0,
+            transcript=f"transcript {i}",
+            analysis={"sentiment": "positive"},
+            metadata={"rep": "alice" if i % 2 else "bob", "tags": ["demo"] if i < 2 else []}
+        )
+        await storage.save_call(call)
+        await storage.save_segments(call.id, [
+            TranscriptSegment(text="hello", start_time=0.0, end_time=1.0, confidence=0.9, speaker="rep"),
+            TranscriptSegment(text="hi", start_time=1.0, end_time=2.0, confidence=0.8)
+        ])
+    await AnalyticsRollupStore(storage).finalize_call(
+        "call_1", datetime(2025, 1, 2, 9), {"rep": "alice"},
+        CallMetrics(talk_ratio=0.5, listen_ratio=0.5, questions_asked=3,
+                    average_sentiment=0.2, duration=3600.0),
+        [Keyword("pricing", 0.9, 2)]
+    )
+
+
+@pytest.mark.asyncio
+async def test_ndjson_export(storage):
+    """Test NDJSON export with filters, segments and metrics"""
+    await _seed(storage)
+    filters = ExportFilter(start=datetime(2025, 1, 2), rep="alice")
+    body = b"".join([chunk async for chunk in iter_ndjson(storage, filters, batch_size=1)])
+    records = [json.loads(line) for line in body.splitlines()]
+
+    assert [r["id"] for r in records] == ["call_1", "call_3"]
+    assert records[0]["metadata"]["rep"] == "alice"
+    assert [s["text"] for s in records[0]["segments"]] == ["hello", "hi"]
+    assert records[0]["metrics"]["keywords"] == [{"word": "pricing", "count": 2}]
+    assert records[1]["metrics"] is None
+
+
+@pytest.mark.asyncio
+async def test_export_projection(storage):
+    """Test only requested fields are exported"""
+    await _seed(storage)
+    filters = ExportFilter(tag="demo", fields=("duration",))
+    body = b"".join([chunk async for chunk in iter_ndjson(storage, filters)])
+    records = [json.loads(line) for line in body.splitlines()]
+    assert records == [{"id": "call_0", "duration": 3600.0}, {"id": "call_1", "duration": 3600.0}]
+
+    with pytest.raises(ValueError):
+        ExportFilter(fields=("password",))
+
+
+@pytest.mark.asyncio
+async def test_parquet_export(storage):
+    """Test Parquet export writes one row group per batch"""
+    pq = pytest.importorskip("pyarrow.parquet")
+    await _seed(storage)
+    chunks = [chunk async for chunk in iter_parquet(storage, ExportFilter(), row_group_size=2)]
+
+    parquet = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+    assert parquet.metadata.num_rows == 5
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.column("id").to_pylist()[0] == "call_0"
+    assert table.column("segments").to_pylist()[0][0]["text"] == "hello"
@@ -0,0 +1,152 @@
+"""
+Tests for sentiment time series and rollups
+"""
+import sqlite3
+import pytest
+from app.modules.analysis import SentimentResult
+from app.modules.storage.sentiment import SentimentSeriesStore
+
+
+def test_signed_score():
+    """Test sentiment labels map to a signed scale"""
+    assert SentimentResult("positive", 0.8, 0.0).signed_score == 0.8
+    assert SentimentResult("negative", 0.8, 0.0).signed_score == -0.8
+    assert SentimentResult("neutral", 0.8, 0.0).signed_score == 0.0
+
+
+@pytest.mark.asyncio
+async def test_raw_points_when_sparse(storage):
+    """Test small ranges return raw points"""
+    series = SentimentSeriesStore(storage)
+    await series.append("call_1", [(1.0, 0.5), (2.0, -0.5), (3.0, 1.0)])
+
+    width, points = await series.get_timeline("call_1", resolution=10)
+    assert width is None
+    assert [p.mean for p in points] == [0.5, -0.5, 1.0]
+
+
+@pytest.mark.asyncio
+async def test_rollups_bound_point_count(storage):
+    """Test a two-hour call is downsampled to the requested resolution"""
+    series = SentimentSeriesStore(storage)
+    points = [(float(t), 1.0 if t % 2 else -1.0) for t in range(7200)]
+    for i in range(0, len(points), 500):
+        await series.append("call_1", points[i:i + 500])
+
+    width, timeline = await series.get_timeline("call_1", resolution=100)
+    assert width == 120
+    assert len(timeline) == 60
+    assert sum(p.count for p in timeline) == 7200
+    assert timeline[0].min == -1.0 and timeline[0].max == 1.0
+    assert timeline[0].mean == pytest.approx(0.0)
+
+    width, timeline = await series.get_timeline("call_1", resolution=5)
+    assert len(timeline) <= 5
+    assert sum(p.count for p in timeline) == 7200
+
+    width, timeline = await series.get_timeline("call_1", resolution=50, start=600, end=899)
+    assert width == 30
+    assert timeline[0].timestamp == 600
+
+    version = await series.get_version("call_1")
+    assert version.count == 7200
+
+
+@pytest.mark.asyncio
+async def test_retried_append_counted_once(storage):
+    """Test repeated timestamps are skipped without losing the batch"""
+    series = SentimentSeriesStore(storage)
+    assert await series.append("call_1", [(1.0, 0.5), (2.0, -0.5)]) == 2
+    assert await series.append("call_1", [(2.0, -0.5), (3.0, 1.0), (3.0, 1.0)]) == 1
+
+    version = await series.get_version("call_1")
+    assert version.count == 3
+    width, points = await series.get_timeline("call_1", resolution=10)
+    assert [p.timestamp for p in points] == [1.0, 2.0, 3.0]
+
+
+@pytest.mark.asyncio
+async def test_failed_append_rolls_back(storage):
+    """Test a failed append leaves neither points nor rollups behind"""
+    series = SentimentSeriesStore(storage)
+    await series.append("call_1", [(1.0, 0.5)])
+    with pytest.raises(sqlite3.IntegrityError):
+        await series.append("call_1", [(2.0, 0.1), (700.0, None)])
+
+    assert (await series.get_version("call_1")).count == 1
+    width, points = await series.get_timeline("call_1", resolution=10)
+    assert [p.timestamp for p in points] == [1.0]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writers(storage):
+    """Test appends interleaved with other commits on the shared connection"""
+    import asyncio
+    from datetime import datetime
+    from app.modules.storage import CallData
+
+    series = SentimentSeriesStore(storage)
+
+    async def appends():
+        for i in range(100):
+            assert await series.append("call_1", [(float(i), 0.5)]) == 1
+
+    async def calls():
+        for i in range(100):
+            await storage.save_call(CallData(
+                id=f"call_{i}", started_at=datetime(2025, 1, 5, 10), ended_at=None,
+                duration=None, transcript="", analysis={}, metadata={}
+            ))
+
+    await asyncio.gather(appends(), calls())
+
+    version = await series.get_version("call_1")
+    assert version.count == 100
+    async with storage.db.execute("SELECT COUNT(*) AS n FROM sentiment_points") as cursor:
+        assert (await cursor.fetchone())["n"] == 100
+    assert len(await storage.list_calls(limit=200)) == 100
+
+
+@pytest.mark.asyncio
+async def test_sentiment_endpoint_caching(storage, monkeypatch):
+    """Test ETag revalidation and cache headers for live and finished calls"""
+    from datetime import datetime
+    import httpx
+    from fastapi import FastAPI
+    from app.api.analysis import router
+    from app.modules import storage as storage_module
+    from app.modules.storage import CallData
+
+    series = SentimentSeriesStore(storage)
+    monkeypatch.setattr(storage_module, "storage", storage)
+    monkeypatch.setattr(storage_module, "sentiment_series", series)
+    call = CallData(id="call_1", started_at=datetime(2025, 1, 5, 10), ended_at=None,
+                    duration=None, transcript="", analysis={}, metadata={})
+    await storage.save_call(call)
+    await series.append("call_1", [(1.0, 0.5), (2.0, -0.5)])
+
+    app = FastAPI()
+    app.include_router(router, prefix="/analysis")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        live = await client.get("/analysis/call_1/sentiment")
+        assert live.status_code == 200
+        assert live.headers["cache-control"] == "no-cache"
+        assert len(live.json()["points"]) == 2
+        etag = live.headers["etag"]
+
+        cached = await client.get("/analysis/call_1/sentiment", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+
+        await series.append("call_1", [(3.0, 1.0)])
+        changed = await client.get("/analysis/call_1/sentiment", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+
+        call.ended_at = datetime(2025, 1, 5, 11)
+        await storage.save_call(call)
+        finished = await client.get("/analysis/call_1/sentiment")
+        assert finished.headers["cache-control"] == "private, max-age=3600"
+
+        assert (await client.get("/analysis/missing/sentiment")).status_code == 404
@@ -0,0 +1,75 @@
+"""
+Tests for deferred model loading and the startup profile
+"""
+import json
+import os
+import subprocess
+import sys
+import pytest
+from app.core.profiling import StartupProfiler
+from app.modules.analysis import AnalysisEngine
+from app.modules.transcription import TranscriptionEngine
+
+
+def test_profiler_records_phases():
+    """Test phases are timed in order"""
+    profiler = StartupProfiler()
+    with profiler.phase("import:api"):
+        pass
+    with profiler.phase("init:database"):
+        pass
+    profiler.mark_ready()
+
+    report = profiler.report()
+    assert [p["name"] for p in report["phases"]] == ["import:api", "init:database"]
+    assert report["ready_ms"] >= report["phases"][-1]["started_at_ms"]
+
+
+@pytest.mark.asyncio
+async def test_models_load_on_first_inference():
+    """Test initialize defers model loading until first use"""
+    transcription = TranscriptionEngine()
+    analysis = AnalysisEngine()
+    await transcription.initialize()
+    await analysis.initialize()
+    assert not transcription.model_loaded
+    assert not analysis.model_loaded
+
+    assert await transcription.transcribe_chunk(b"\x00" * 3200) is not None
+    assert (await analysis.analyze_sentiment("great demo")).label == "positive"
+    assert transcription.model_loaded
+    assert analysis.model_loaded
+
+
+def test_startup_imports_no_ml_libraries(tmp_path):
+    """Test a full app startup with the default backend never imports ML libraries"""
+    script = """
+import json, sys
+from fastapi.testclient import TestClient
+from app.main import app
+
+with TestClient(app) as client:
+    profile = client.get("/health/startup").json()
+heavy = [m for m in ("torch", "transformers", "faster_whisper") if m in sys.modules]
+print(json.dumps({"heavy": heavy, "profile": profile}))
+"""
+    env = dict(
+        os.environ,
+        ML_BACKEND="local",
+        PRELOAD_MODELS="true",
+        DATABASE_URL=f"sqlite:///{tmp_path / 'test.db'}",
+        AUDIO_STORAGE_PATH=str(tmp_path / "audio")
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env, capture_output=True, text=True, check=True
+    )
+    output = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert output["heavy"] == []
+    names = [p["name"] for p in output["profile"]["phases"]]
+    assert "import:api" in names
+    assert "model_load:transcription" in names
+    assert "init:database" in names
+    assert output["profile"]["ready_ms"] > 0
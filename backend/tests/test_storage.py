@@ -0,0 +1,340 @@
+"""
+Tests for storage module and audio retention
+"""
+import pytest
+import pytest_asyncio
+import wave
+from datetime import datetime, timedelta
+from app.modules.storage import CallData
+from app.modules.storage.audio import AudioStorageManager, STATE_ARCHIVED
+
+
+@pytest_asyncio.fixture
+async def audio_storage(storage, tmp_path):
+    manager = AudioStorageManager(storage, base_path=str(tmp_path / "audio"), codec="wav")
+    await manager.start(schedule_purge=False)
+    yield manager
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_save_and_get_call(storage):
+    """Test call round trip"""
+    call = CallData(
+        id="call_1",
+        started_at=datetime(2025, 1, 5, 10, 30),
+        ended_at=None,
+        duration=None,
+        transcript="hello",
+        analysis={"sentiment": "positive"},
+        metadata={"rep": "alice"}
+    )
+    await storage.save_call(call)
+
+    loaded = await storage.get_call("call_1")
+    assert loaded == call
+    assert await storage.delete_call("call_1") is True
+    assert await storage.get_call("call_1") is None
+
+
+@pytest.mark.asyncio
+async def test_encrypted_transcript_bound_to_call(storage):
+    """Test an encrypted transcript copied onto another call is rejected"""
+    from app.core.crypto import DecryptionError, generate_key, load_storage_key
+    from app.modules.storage import TranscriptSegment
+    storage.key = load_storage_key(generate_key())
+    for call_id in ("call_1", "call_2"):
+        await storage.save_call(CallData(
+            id=call_id,
+            started_at=datetime(2025, 1, 5, 10, 30),
+            ended_at=None,
+            duration=None,
+            transcript=f"secret {call_id}",
+            analysis={},
+            metadata={}
+        ))
+    await storage.save_segments("call_1", [
+        TranscriptSegment(speaker="rep", text="secret", start_time=0, end_time=1, confidence=0.9)
+    ])
+    assert (await storage.get_call("call_1")).transcript == "secret call_1"
+    assert (await storage.get_segments("call_1"))[0].text == "secret"
+
+    await storage.db.execute(
+        "UPDATE calls SET transcript = (SELECT transcript FROM calls WHERE id = 'call_1') WHERE id = 'call_2'"
+    )
+    with pytest.raises(DecryptionError):
+        await storage.get_call("call_2")
+    await storage.db.execute(
+        "UPDATE transcript_segments SET text = (SELECT transcript FROM calls WHERE id = 'call_1')"
+    )
+    with pytest.raises(DecryptionError):
+        await storage.get_segments("call_1")
+
+
+@pytest_asyncio.fixture
+async def short_segment_storage(storage, tmp_path, monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "AUDIO_SEGMENT_SECONDS", 1)
+    manager = AudioStorageManager(storage, base_path=str(tmp_path / "audio"), codec="wav")
+    await manager.start(schedule_purge=False)
+    yield manager
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_audio_segments_archived(short_segment_storage):
+    """Test live audio is segmented then archived"""
+    audio_storage = short_segment_storage
+    await audio_storage.open_call("call_1")
+    for _ in range(25):  # 2.5s of 100ms chunks
+        await audio_storage.write("call_1", b"\x01\x00" * 1600)
+
+    assert len(audio_storage.writers["call_1"].segments) == 3
+    usage = await audio_storage.get_disk_usage()
+    assert usage.total_bytes == 25 * 3200
+
+    await audio_storage.finish_call("call_1")
+    await audio_storage.join()
+
+    async with audio_storage.storage.db.execute(
+        "SELECT * FROM audio_files WHERE call_id = 'call_1'"
+    ) as cursor:
+        row = await cursor.fetchone()
+    assert row["state"] == STATE_ARCHIVED
+    with wave.open(row["path"], "rb") as f:
+        assert f.getnframes() == 25 * 1600
+    assert not (audio_storage.call_dir("call_1") / "segments").exists()
+    assert list(audio_storage.waveform_dir("call_1").glob("peaks_*.i16"))
+
+
+@pytest.mark.asyncio
+async def test_invalid_segment_length(storage, tmp_path, monkeypatch):
+    """Test a non-positive segment length is rejected at startup"""
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "AUDIO_SEGMENT_SECONDS", 0)
+
+    manager = AudioStorageManager(storage, base_path=str(tmp_path / "audio"), codec="wav")
+    with pytest.raises(ValueError):
+        await manager.start(schedule_purge=False)
+
+
+@pytest.mark.asyncio
+async def test_invalid_purge_interval(storage, tmp_path, monkeypatch):
+    """Test a non-positive purge interval is rejected at startup"""
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "AUDIO_PURGE_INTERVAL_MINUTES", 0)
+
+    manager = AudioStorageManager(storage, base_path=str(tmp_path / "audio"), codec="wav")
+    with pytest.raises(ValueError):
+        await manager.start()
+
+
+@pytest.mark.asyncio
+async def test_delete_call_removes_audio(audio_storage):
+    """Test deleting a call removes its audio row, files and waveform"""
+    storage = audio_storage.storage
+    for call_id in ("archived_call", "live_call"):
+        await storage.save_call(CallData(
+            id=call_id,
+            started_at=datetime(2025, 1, 5, 10, 30),
+            ended_at=None,
+            duration=None,
+            transcript="",
+            analysis={},
+            metadata={}
+        ))
+        await audio_storage.open_call(call_id)
+        await audio_storage.write(call_id, b"\x00" * 3200)
+    await audio_storage.finish_call("archived_call")
+    await audio_storage.join()
+    assert audio_storage.waveform_dir("archived_call").exists()
+
+    for call_id in ("archived_call", "live_call"):
+        assert await storage.delete_call(call_id)
+        assert await audio_storage.get_audio_file(call_id) is None
+        assert not audio_storage.call_dir(call_id).exists()
+    assert audio_storage.writers == {}
+    usage = await audio_storage.get_disk_usage()
+    assert usage.file_count == 0
+
+
+@pytest.mark.asyncio
+async def test_purge_expired(audio_storage):
+    """Test expired audio files and rows are purged"""
+    for call_id in ("old_call", "new_call"):
+        await audio_storage.open_call(call_id)
+        await audio_storage.write(call_id, b"\x00" * 3200)
+        await audio_storage.finish_call(call_id)
+    await audio_storage.join()
+
+    old = (datetime.now() - timedelta(days=30)).isoformat()
+    await audio_storage.storage.db.execute(
+        "UPDATE audio_files SET created_at = ? WHERE call_id = 'old_call'", (old,)
+    )
+    await audio_storage.storage.db.commit()
+
+    assert await audio_storage.purge_expired() == 1
+    assert not audio_storage.call_dir("old_call").exists()
+    assert audio_storage.call_dir("new_call").exists()
+    usage = await audio_storage.get_disk_usage()
+    assert usage.file_count == 1
+
+
+@pytest.mark.asyncio
+async def test_encrypted_audio_storage(storage, tmp_path, monkeypatch):
+    """Test segments and archives are encrypted when a key is configured"""
+    from app.core.config import settings
+    from app.core.crypto import EncryptedReader, generate_key
+    monkeypatch.setattr(settings, "STORAGE_ENCRYPTION_KEY", generate_key())
+
+    manager = AudioStorageManager(storage, base_path=str(tmp_path / "audio"), codec="wav")
+    await manager.start(schedule_purge=False)
+    try:
+        await manager.open_call("call_1")
+        await manager.write("call_1", b"\x01\x02" * 16000)
+        segment = manager.writers["call_1"].segments[0]
+        await manager.finish_call("call_1")
+        assert segment.name.endswith(".pcm.enc")
+        await manager.join()
+
+        info = await manager.get_audio_file("call_1")
+        assert info.path.endswith(".wav.enc")
+        assert info.codec == "wav"
+        assert info.duration == pytest.approx(1.0)
+        with EncryptedReader(info.path, manager.key) as reader:
+            assert reader.read(4) == b"RIFF"
+    finally:
+        await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_encrypted_archive_failure_leaves_no_plaintext(storage, tmp_path, monkeypatch):
+    """Test a failed encrypted archive removes its temporary encodings"""
+    from app.core.config import settings
+    from app.core.crypto import generate_key
+    from app.modules.storage import audio
+    monkeypatch.setattr(settings, "STORAGE_ENCRYPTION_KEY", generate_key())
+
+    def fail(*args):
+        raise OSError("disk full")
+    monkeypatch.setattr(audio, "encrypt_file", fail)
+
+    manager = AudioStorageManager(storage, base_path=str(tmp_path / "audio"), codec="flac")
+    await manager.start(schedule_purge=False)
+    try:
+        await manager.open_call("call_1")
+        await manager.write("call_1", b"\x01\x02" * 16000)
+        await manager.finish_call("call_1")
+        await manager.join()
+
+        info = await manager.get_audio_file("call_1")
+        assert info.state == audio.STATE_RAW
+        call_dir = manager.call_dir("call_1")
+        assert not list(call_dir.rglob("*.tmp"))
+        assert not list(call_dir.glob("audio.*"))
+    finally:
+        await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_unclosed_encrypted_segment_recovered(storage, tmp_path, monkeypatch):
+    """Test audio sealed before a crash is archived after restart"""
+    from app.core.config import settings
+    from app.core.crypto import DEFAULT_BLOCK_SIZE, EncryptedReader, generate_key
+    monkeypatch.setattr(settings, "STORAGE_ENCRYPTION_KEY", generate_key())
+    base_path = str(tmp_path / "audio")
+
+    manager = AudioStorageManager(storage, base_path=base_path, codec="wav")
+    await manager.start(schedule_purge=False)
+    await manager.open_call("call_1")
+    await manager.write("call_1", b"\x01\x02" * (DEFAULT_BLOCK_SIZE * 3 // 2 + 500))
+    # Simulate a crash: sealed blocks reach disk, the final block never does
+    writer = manager.writers.pop("call_1")
+    writer._file._file.close()
+    await manager.stop()
+
+    manager = AudioStorageManager(storage, base_path=base_path, codec="wav")
+    await manager.start(schedule_purge=False)
+    try:
+        await manager.join()
+        info = await manager.get_audio_file("call_1")
+        assert info.state == STATE_ARCHIVED
+        with EncryptedReader(info.path, manager.key) as reader:
+            header = reader.read(44)
+            assert header[:4] == b"RIFF"
+            assert reader.size - 44 == DEFAULT_BLOCK_SIZE * 3
+    finally:
+        await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_empty_call_archived(audio_storage):
+    """Test a call finished without audio still archives"""
+    await audio_storage.open_call("call_1")
+    await audio_storage.finish_call("call_1")
+    await audio_storage.join()
+
+    info = await audio_storage.get_audio_file("call_1")
+    assert info.state == STATE_ARCHIVED
+    with wave.open(info.path, "rb") as f:
+        assert f.getnframes() == 0
+
+
+@pytest.mark.asyncio
+async def test_audio_endpoint_states(audio_storage, monkeypatch):
+    """Test only in-progress audio is reported as retryable"""
+    from fastapi import HTTPException
+    from app.api import calls
+    from app.modules import storage as storage_module
+    from app.modules.storage.audio import STATE_RAW
+    monkeypatch.setattr(storage_module, "audio_storage", audio_storage)
+
+    await audio_storage.open_call("call_1")
+    with pytest.raises(HTTPException) as exc:
+        await calls._get_archived_audio("call_1")
+    assert exc.value.status_code == 409
+
+    await audio_storage.storage.db.execute(
+        "UPDATE audio_files SET state = ? WHERE call_id = 'call_1'", (STATE_RAW,)
+    )
+    with pytest.raises(HTTPException) as exc:
+        await calls._get_archived_audio("call_1")
+    assert exc.value.status_code == 422
+
+    with pytest.raises(HTTPException) as exc:
+        await calls._get_archived_audio("missing")
+    assert exc.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_audio_endpoints(audio_storage, monkeypatch):
+    """Test HEAD and multi-range audio requests and waveform range validation"""
+    import httpx
+    from fastapi import FastAPI
+    from app.api.calls import router
+    from app.modules import storage as storage_module
+    monkeypatch.setattr(storage_module, "audio_storage", audio_storage)
+
+    await audio_storage.open_call("call_1")
+    await audio_storage.write("call_1", b"\x01\x00" * 16000)
+    await audio_storage.finish_call("call_1")
+    await audio_storage.join()
+    size = (await audio_storage.get_audio_file("call_1")).size_bytes
+
+    app = FastAPI()
+    app.include_router(router, prefix="/calls")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        head = await client.head("/calls/call_1/audio")
+        assert head.status_code == 200
+        assert head.headers["content-length"] == str(size)
+        assert head.content == b""
+
+        multi = await client.get("/calls/call_1/audio", headers={"Range": "bytes=0-9,20-29"})
+        assert multi.status_code == 200
+        assert len(multi.content) == size
+
+        waveform = await client.get("/calls/call_1/waveform", params={"start": 0.5, "end": 0.5})
+        assert waveform.status_code == 422
+        waveform = await client.get("/calls/call_1/waveform", params={"start": 0, "end": 0.5})
+        assert waveform.status_code == 200
@@ -0,0 +1,83 @@
+"""
+Tests for waveform peaks and range playback
+"""
+import numpy as np
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.api.responses import RangeFileResponse
+from app.modules.storage.waveform import build_peak_pyramid, read_peaks
+
+
+def _write_pcm(path, seconds, sample_rate=16000):
+    t = np.arange(int(seconds * sample_rate))
+    samples = (np.sin(t / 20) * 1000 * (1 + t // sample_rate)).astype("<i2")
+    path.write_bytes(samples.tobytes())
+    return samples
+
+
+def test_peak_pyramid_levels(tmp_path):
+    """Test every level halves the resolution"""
+    samples = _write_pcm(tmp_path / "0.pcm", 10)
+    levels = build_peak_pyramid([tmp_path / "0.pcm"], tmp_path / "waveform")
+
+    assert levels[0] == 64
+    assert all(b == a * 2 for a, b in zip(levels, levels[1:]))
+    top = np.fromfile(tmp_path / "waveform" / f"peaks_{levels[-1]}.i16", dtype="<i2")
+    assert top.reshape(-1, 2)[:, 0].min() == samples.min()
+    assert top.reshape(-1, 2)[:, 1].max() == samples.max()
+
+
+def test_read_peaks_bounded(tmp_path):
+    """Test reads return at most px peaks and preserve extremes"""
+    samples = _write_pcm(tmp_path / "0.pcm", 10)
+    build_peak_pyramid([tmp_path / "0.pcm"], tmp_path / "waveform")
+
+    peaks = read_peaks(tmp_path / "waveform", start=0, end=10, px=100)
+    assert len(peaks.min) == 100
+    assert min(peaks.min) == samples.min()
+    assert max(peaks.max) == samples.max()
+
+    # A short zoomed-in window uses the finest level
+    zoomed = read_peaks(tmp_path / "waveform", start=2.0, end=2.01, px=100)
+    assert zoomed.samples_per_peak == 64
+    assert len(zoomed.min) <= 100
+
+
+def test_empty_recording(tmp_path):
+    """Test a call without audio writes no levels"""
+    (tmp_path / "0.pcm").write_bytes(b"")
+    assert build_peak_pyramid([tmp_path / "0.pcm"], tmp_path / "waveform") == []
+    assert not list((tmp_path / "waveform").glob("peaks_*.i16"))
+    assert read_peaks(tmp_path / "waveform", start=0, end=10, px=100) is None
+
+
+def test_range_file_response(tmp_path):
+    """Test partial content responses"""
+    path = tmp_path / "audio.wav"
+    path.write_bytes(bytes(range(256)) * 4)
+
+    app = FastAPI()
+
+    @app.get("/audio")
+    async def audio(request: Request):
+        return RangeFileResponse(str(path), request.headers.get("range"), "audio/wav")
+
+    client = TestClient(app)
+    full = client.get("/audio")
+    assert full.status_code == 200
+    assert full.headers["accept-ranges"] == "bytes"
+    assert len(full.content) == 1024
+
+    partial = client.get("/audio", headers={"Range": "bytes=10-19"})
+    assert partial.status_code == 206
+    assert partial.headers["content-range"] == "bytes 10-19/1024"
+    assert partial.content == bytes(range(10, 20))
+
+    suffix = client.get("/audio", headers={"Range": "bytes=-4"})
+    assert suffix.content == bytes(range(252, 256))
+
+    multi = client.get("/audio", headers={"Range": "bytes=0-9,20-29"})
+    assert multi.status_code == 200
+    assert len(multi.content) == 1024
+
+    assert client.get("/audio", headers={"Range": "bytes=2000-"}).status_code == 416